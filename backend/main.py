@@ -1,4 +1,5 @@
 from pathlib import Path
+import os
 import sys
 
 import uvicorn
@@ -9,12 +10,30 @@ SRC_PATH = PROJECT_ROOT / "src"
 if str(SRC_PATH) not in sys.path:
     sys.path.insert(0, str(SRC_PATH))
 
-from app.main import app
+
+# Every worker holds its own DB pool (DB_POOL_SIZE + DB_MAX_OVERFLOW); four workers at the
+# default 10 + 10 stay under Postgres' default max_connections=100.
+_MAX_DEFAULT_WORKERS = 4
+
+
+def _default_workers() -> int:
+    # 2n+1 sizing (one worker per core blocked on I/O plus one spare), capped by the connection budget.
+    return min(2 * (os.cpu_count() or 1) + 1, _MAX_DEFAULT_WORKERS)
 
 
 def main() -> None:
-    """Run a development server."""
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    """Run the API server (multi-process; uvloop + httptools when installed)."""
+    uvicorn.run(
+        "app.main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        # "auto" picks uvloop/httptools when available and falls back to asyncio/h11 (e.g. on Windows)
+        loop="auto",
+        http="auto",
+        workers=int(os.getenv("WEB_CONCURRENCY", _default_workers())),
+        log_level="warning",
+        access_log=False,
+    )
 
 
 if __name__ == "__main__":
@@ -1,3 +1,4 @@
+import asyncio
 from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -8,6 +9,7 @@ from sqlmodel import Session, select
 from app.core.config import settings
 from app.core.security import create_access_token, get_password_hash, verify_password
 from app.db import get_session
+from app.dependencies import forget_user
 from app.models.db_models import User
 
 router = APIRouter()
@@ -26,24 +28,38 @@ class RegisterRequest(BaseModel):
     role: str | None = None  # default user; admin creation should be controlled externally
 
 
+# the handlers stay async so password hashing can be awaited in a thread; the blocking
+# DB calls go through these helpers the same way
+def _find_user(session: Session, username: str) -> User | None:
+    return session.exec(select(User).where(User.username == username)).first()
+
+
+def _save_user(session: Session, user: User) -> None:
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+
+
 @router.post("/register", response_model=TokenResponse, status_code=201)
 async def register(payload: RegisterRequest, session: Session = Depends(get_session)) -> TokenResponse:
     if settings.app_env.lower() == "development":
         raise HTTPException(status_code=403, detail="当前环境不允许注册新用户")
 
-    existing = session.exec(select(User).where(User.username == payload.username)).first()
+    existing = await asyncio.to_thread(_find_user, session, payload.username)
     if existing:
         raise HTTPException(status_code=400, detail="用户已存在")
 
     role = payload.role if payload.role in {"admin", "user"} else "user"
+    # pbkdf2 is deliberately slow; keep it off the event loop
+    hashed_password = await asyncio.to_thread(get_password_hash, payload.password)
     user = User(
         username=payload.username,
-        hashed_password=get_password_hash(payload.password),
+        hashed_password=hashed_password,
         role=role,
     )
-    session.add(user)
-    session.commit()
-    session.refresh(user)
+    await asyncio.to_thread(_save_user, session, user)
+    # role and password are written here; no worker may keep serving an older copy
+    await asyncio.to_thread(forget_user, user.username)
     token = create_access_token({"sub": user.username, "role": user.role})
     return TokenResponse(access_token=token, username=user.username, role=user.role)
 
@@ -52,14 +68,14 @@ async def register(payload: RegisterRequest, session: Session = Depends(get_sess
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(), session: Session = Depends(get_session)
 ) -> TokenResponse:
-    user = session.exec(select(User).where(User.username == form_data.username)).first()
+    user = await asyncio.to_thread(_find_user, session, form_data.username)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="用户不存在",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    if not verify_password(form_data.password, user.hashed_password):
+    if not await asyncio.to_thread(verify_password, form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="密码错误",
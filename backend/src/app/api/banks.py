@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import delete
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import case, delete, insert, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlmodel import Session, select
 
-from app.dependencies import get_current_user, require_admin
+from app.core.cache import response_cache
+from app.dependencies import bank_visibility, forget_bank, get_current_user, require_admin
 from app.db import get_session
 from app.models import schemas
 from app.models.db_models import (
@@ -17,9 +20,12 @@ from app.models.db_models import (
 
 router = APIRouter(redirect_slashes=False)
 
+# columns serialized by schemas.Bank; selecting only these skips ORM hydration on list endpoints
+_BANK_COLUMNS = (Bank.id, Bank.title, Bank.description, Bank.is_public)
+
 
 def _to_schema(bank: Bank) -> schemas.Bank:
-    return schemas.Bank(
+    return schemas.Bank.model_construct(
         id=bank.id,
         title=bank.title,
         description=bank.description,
@@ -27,82 +33,72 @@ def _to_schema(bank: Bank) -> schemas.Bank:
     )
 
 
-def _ensure_readable(bank: Bank, user: User) -> None:
-    if user.role != "admin" and not bank.is_public:
-        raise HTTPException(status_code=403, detail="无权访问非公开题库")
-
-
-@router.get("/", response_model=list[schemas.Bank])
-async def list_banks(
+@router.get("/", responses={200: {"model": list[schemas.Bank]}})
+def list_banks(
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
-) -> list[schemas.Bank]:
-    stmt = select(Bank)
+) -> ORJSONResponse:
+    stmt = select(*_BANK_COLUMNS)
     if current_user.role != "admin":
         stmt = stmt.where(Bank.is_public.is_(True))
-    banks = session.exec(stmt).all()
-    return [_to_schema(b) for b in banks]
+    rows = session.exec(stmt).all()
+    return ORJSONResponse([row._asdict() for row in rows])
 
 
-@router.get("/favorites", response_model=list[schemas.Bank])
-async def list_favorites(
+@router.get("/favorites", responses={200: {"model": list[schemas.Bank]}})
+def list_favorites(
     session: Session = Depends(get_session), current_user: User = Depends(get_current_user)
-) -> list[schemas.Bank]:
-    stmt = (
-        select(Bank)
-        .join(FavoriteBank, FavoriteBank.bank_id == Bank.id)
-        .where(FavoriteBank.user_id == current_user.id)
-    )
+) -> ORJSONResponse:
+    favorite_bank_ids = select(FavoriteBank.bank_id).where(FavoriteBank.user_id == current_user.id)
+    stmt = select(*_BANK_COLUMNS).where(Bank.id.in_(favorite_bank_ids))
     if current_user.role != "admin":
         stmt = stmt.where(Bank.is_public.is_(True))
-    joins = session.exec(stmt).all()
-    return [_to_schema(b) for b in joins]
+    rows = session.exec(stmt).all()
+    return ORJSONResponse([row._asdict() for row in rows])
 
 
 @router.post("/{bank_id}/favorite", status_code=204)
-async def add_favorite(
+def add_favorite(
     bank_id: int,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ) -> None:
-    bank = session.get(Bank, bank_id)
-    if not bank:
+    is_public = bank_visibility(session, bank_id)
+    if is_public is None:
         raise HTTPException(status_code=404, detail="Bank not found")
-    _ensure_readable(bank, current_user)
-    exists = session.exec(
-        select(FavoriteBank).where(
-            FavoriteBank.user_id == current_user.id, FavoriteBank.bank_id == bank_id
-        )
-    ).first()
-    if not exists:
-        session.add(FavoriteBank(user_id=current_user.id, bank_id=bank_id))
-        session.commit()
+    if current_user.role != "admin" and not is_public:
+        raise HTTPException(status_code=403, detail="无权访问非公开题库")
+    # idempotent insert backed by the uq_user_bank_fav unique index; no pre-check SELECT needed
+    session.exec(
+        pg_insert(FavoriteBank)
+        .values(user_id=current_user.id, bank_id=bank_id)
+        .on_conflict_do_nothing(index_elements=["user_id", "bank_id"])
+    )
+    session.commit()
     return None
 
 
 @router.delete("/{bank_id}/favorite", status_code=204)
-async def remove_favorite(
+def remove_favorite(
     bank_id: int,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ) -> None:
-    fav = session.exec(
-        select(FavoriteBank).where(
+    result = session.exec(
+        delete(FavoriteBank).where(
             FavoriteBank.user_id == current_user.id, FavoriteBank.bank_id == bank_id
         )
-    ).first()
-    if fav:
-        bank = session.get(Bank, bank_id)
-        if bank:
-            _ensure_readable(bank, current_user)
-    if fav:
-        session.delete(fav)
+    )
+    if result.rowcount:
+        # raising here leaves the delete uncommitted; the session rolls it back
+        if current_user.role != "admin" and bank_visibility(session, bank_id) is False:
+            raise HTTPException(status_code=403, detail="无权访问非公开题库")
         session.commit()
     return None
 
 
 @router.post("/", response_model=schemas.Bank, status_code=201)
-async def create_bank(
+def create_bank(
     payload: schemas.BankCreate,
     session: Session = Depends(get_session),
     admin: User = Depends(require_admin),
@@ -120,7 +116,7 @@ async def create_bank(
 
 
 @router.put("/{bank_id}", response_model=schemas.Bank)
-async def update_bank(
+def update_bank(
     bank_id: int,
     payload: schemas.BankUpdate,
     session: Session = Depends(get_session),
@@ -135,11 +131,14 @@ async def update_bank(
     session.add(bank)
     session.commit()
     session.refresh(bank)
+    # visibility changes alter every user's favourite-question list
+    response_cache.bump("questions")
+    forget_bank(bank_id)
     return _to_schema(bank)
 
 
 @router.delete("/{bank_id}", status_code=204)
-async def delete_bank(
+def delete_bank(
     bank_id: int,
     session: Session = Depends(get_session),
     admin: User = Depends(require_admin),
@@ -149,25 +148,32 @@ async def delete_bank(
         raise HTTPException(status_code=404, detail="Bank not found")
     # delete dependent records: favorites (bank/questions), wrong records, study sessions, questions
     # remove study sessions first to avoid FK constraint on bank_id
-    session.exec(delete(StudySession).where(StudySession.bank_id == bank_id))
-
-    question_ids = [
-        q.id for q in session.exec(select(Question).where(Question.bank_id == bank_id)).all() if q.id
-    ]
-    if question_ids:
-        session.exec(delete(FavoriteQuestion).where(FavoriteQuestion.question_id.in_(question_ids)))
-        session.exec(delete(WrongRecord).where(WrongRecord.question_id.in_(question_ids)))
-        session.exec(delete(Question).where(Question.id.in_(question_ids)))
+    bulk = {"synchronize_session": False}
+    session.exec(delete(StudySession).where(StudySession.bank_id == bank_id).execution_options(**bulk))
+
+    # question ids stay inside the DB as a subquery instead of round-tripping through Python
+    question_ids = select(Question.id).where(Question.bank_id == bank_id)
+    session.exec(
+        delete(FavoriteQuestion)
+        .where(FavoriteQuestion.question_id.in_(question_ids))
+        .execution_options(**bulk)
+    )
+    session.exec(
+        delete(WrongRecord).where(WrongRecord.question_id.in_(question_ids)).execution_options(**bulk)
+    )
+    session.exec(delete(Question).where(Question.bank_id == bank_id).execution_options(**bulk))
 
-    session.exec(delete(FavoriteBank).where(FavoriteBank.bank_id == bank_id))
+    session.exec(delete(FavoriteBank).where(FavoriteBank.bank_id == bank_id).execution_options(**bulk))
 
     session.delete(bank)
     session.commit()
+    response_cache.bump("questions")
+    forget_bank(bank_id)  # bumps bank:{id} too, dropping its cached question lists
     return None
 
 
 @router.post("/merge", response_model=schemas.BankMergeResponse, status_code=201)
-async def merge_banks(
+def merge_banks(
     payload: schemas.BankMergeRequest,
     session: Session = Depends(get_session),
     admin: User = Depends(require_admin),
@@ -188,29 +194,27 @@ async def merge_banks(
         created_by=admin.id,
     )
     session.add(new_bank)
-    session.commit()
-    session.refresh(new_bank)
-
-    merged_count = 0
-    for bank_id in source_ids:
-        questions = session.exec(select(Question).where(Question.bank_id == bank_id)).all()
-        for q in questions:
-            cloned_options = []
-            for opt in q.options or []:
-                if isinstance(opt, dict):
-                    cloned_options.append({**opt})
-                else:
-                    cloned_options.append(opt)
-            new_question = Question(
-                bank_id=new_bank.id,
-                type=q.type,
-                content=q.content,
-                options=cloned_options,
-                standard_answer=q.standard_answer,
-                analysis=q.analysis,
+    session.flush()  # assign new_bank.id; bank and copied questions commit together
+
+    # copy every source question with one INSERT ... SELECT, keeping the source bank order
+    source_order = case({bid: idx for idx, bid in enumerate(source_ids)}, value=Question.bank_id)
+    copy_columns = ["bank_id", "type", "content", "options", "standard_answer", "analysis"]
+    result = session.exec(
+        insert(Question).from_select(
+            copy_columns,
+            select(
+                literal(new_bank.id),
+                Question.type,
+                Question.content,
+                Question.options,
+                Question.standard_answer,
+                Question.analysis,
             )
-            session.add(new_question)
-            merged_count += 1
+            .where(Question.bank_id.in_(source_ids))
+            .order_by(source_order, Question.id),
+        ).execution_options(preserve_rowcount=True)
+    )
+    merged_count = result.rowcount
     session.commit()
 
     return schemas.BankMergeResponse(
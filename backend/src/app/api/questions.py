@@ -1,64 +1,96 @@
+import asyncio
+import base64
+import binascii
 import logging
-
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, or_
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable
+from uuid import uuid4
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import Row, delete, exists, func, lambda_stmt, or_, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import aliased
 from sqlmodel import Session, select
 
-from app.dependencies import get_current_user, require_admin
-from app.db import get_session
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.dependencies import bank_visibility, get_current_user, require_admin
+from app.db import SessionLocal, get_session
 from app.models import schemas
-from app.models.db_models import Bank, FavoriteQuestion, Question as QuestionDB, User, QuestionIssue
+from app.models.db_models import (
+    Bank,
+    FavoriteQuestion,
+    ImportJob,
+    Question as QuestionDB,
+    QuestionIssue,
+    User,
+    question_content_hash,
+)
 from app.services.ai_service import AIServiceError, ai_service
 from app.services.ai_stub import generate_questions_from_text
 from app.services.batch_importer import BatchImportService
 from pathlib import Path
 
-router = APIRouter(redirect_slashes=False)
+router = APIRouter(redirect_slashes=False, default_response_class=ORJSONResponse)
 logger = logging.getLogger(__name__)
 
-
-def _to_schema(q: QuestionDB) -> schemas.Question:
-    return schemas.Question(
+# columns read by _to_payload; list endpoints select these instead of hydrating ORM objects
+_QUESTION_COLUMNS = (
+    QuestionDB.id,
+    QuestionDB.bank_id,
+    QuestionDB.type,
+    QuestionDB.content,
+    QuestionDB.options,
+    QuestionDB.standard_answer,
+    QuestionDB.analysis,
+)
+
+
+def _to_schema(q: QuestionDB | Row) -> schemas.Question:
+    # rows were validated on the way in; model_construct skips re-validating them
+    return schemas.Question.model_construct(
         id=q.id,
         bank_id=q.bank_id,
         type=q.type,
         content=q.content,
-        options=[schemas.Option(**opt) for opt in q.options or []],
+        options=schemas.stored_options(q.options),
         standard_answer=q.standard_answer,
         analysis=q.analysis,
     )
 
 
-def _question_exists(session: Session, payload: schemas.QuestionCreate) -> QuestionDB | None:
-    stmt = select(QuestionDB).where(
-        QuestionDB.bank_id == payload.bank_id,
-        QuestionDB.type == payload.type,
-        QuestionDB.content == payload.content,
-    )
-    candidate = session.exec(stmt).first()
-    if not candidate:
-        return None
+def _to_payload(q: QuestionDB | Row, is_favorited: bool = False) -> dict[str, Any]:
+    return {
+        "bank_id": q.bank_id,
+        "type": q.type,
+        "content": q.content,
+        "options": [{"key": opt["key"], "text": opt["text"]} for opt in q.options or []],
+        "standard_answer": q.standard_answer,
+        "analysis": q.analysis,
+        "is_favorited": is_favorited,
+        "id": q.id,
+    }
+
+
+def _is_duplicate(candidate: QuestionDB, payload: schemas.QuestionCreate) -> bool:
     if payload.type in {"choice_single", "choice_multi"}:
         if candidate.standard_answer.strip().lower() != payload.standard_answer.strip().lower():
-            return None
+            return False
         if len(candidate.options) != len(payload.options):
-            return None
-        opts_match = all(
+            return False
+        return all(
             co.get("key") == po.key and (co.get("text") or "").strip() == po.text.strip()
             for co, po in zip(candidate.options, payload.options)
         )
-        return candidate if opts_match else None
     if payload.type == "short_answer":
-        if candidate.standard_answer.strip().lower() == payload.standard_answer.strip().lower():
-            return candidate
-    return None
+        return candidate.standard_answer.strip().lower() == payload.standard_answer.strip().lower()
+    return False
 
 
-def _create_question(session: Session, payload: schemas.QuestionCreate) -> QuestionDB:
-    duplicate = _question_exists(session, payload)
-    if duplicate:
-        return duplicate
-    obj = QuestionDB(
+def _build_question(payload: schemas.QuestionCreate) -> QuestionDB:
+    return QuestionDB(
         bank_id=payload.bank_id,
         type=payload.type,
         content=payload.content,
@@ -66,108 +98,197 @@ def _create_question(session: Session, payload: schemas.QuestionCreate) -> Quest
         standard_answer=payload.standard_answer,
         analysis=payload.analysis,
     )
-    session.add(obj)
-    session.commit()
-    session.refresh(obj)
-    return obj
+
+
+def _create_questions(
+    session: Session, payloads: list[schemas.QuestionCreate]
+) -> list[QuestionDB]:
+    """Add new questions in one flush, reusing identical existing ones.
+
+    Duplicates are looked up with a single query on the indexed content hash
+    for the whole batch and also matched against questions added earlier in
+    the same batch. The caller commits.
+    """
+    if not payloads:
+        return []
+    candidates: dict[tuple[int, str, str], list[QuestionDB]] = defaultdict(list)
+    hashes = [question_content_hash(t, c) for t, c in {(p.type, p.content) for p in payloads}]
+    existing = session.exec(
+        select(QuestionDB)
+        .where(
+            QuestionDB.bank_id.in_({p.bank_id for p in payloads}),
+            QuestionDB.content_hash.in_(hashes),
+        )
+        .order_by(QuestionDB.id)
+    ).all()
+    for q in existing:
+        candidates[(q.bank_id, q.type, q.content)].append(q)
+
+    created: list[QuestionDB] = []
+    for payload in payloads:
+        key = (payload.bank_id, payload.type, payload.content)
+        question = next((c for c in candidates[key] if _is_duplicate(c, payload)), None)
+        if question is None:
+            question = _build_question(payload)
+            session.add(question)
+            candidates[key].append(question)
+        created.append(question)
+    session.flush()
+    return created
 
 
 def _ensure_bank(session: Session, bank_id: int) -> None:
-    bank = session.get(Bank, bank_id)
-    if not bank:
+    if not session.exec(select(exists().where(Bank.id == bank_id))).one():
         raise HTTPException(status_code=404, detail="Bank not found")
 
 
 def _ensure_bank_readable(session: Session, bank_id: int, user: User) -> None:
-    bank = session.get(Bank, bank_id)
-    if not bank:
+    is_public = bank_visibility(session, bank_id)
+    if is_public is None:
         raise HTTPException(status_code=404, detail="Bank not found")
-    if user.role != "admin" and not bank.is_public:
+    if user.role != "admin" and not is_public:
         raise HTTPException(status_code=403, detail="无权访问非公开题库")
 
 
-@router.get("/", response_model=schemas.PaginatedQuestions)
-async def list_questions(
+def _encode_cursor(created_at: datetime, question_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{question_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, question_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(question_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _question_page(
+    session: Session,
+    bank_id: int,
+    page: int,
+    page_size: int,
+    user_id: int,
+    cursor: tuple[datetime, int] | None = None,
+) -> dict[str, Any]:
+    # the count only changes with the bank's contents, so every page shares one cached value
+    total_count = response_cache.count(
+        f"qcount:{bank_id}",
+        (f"bank:{bank_id}",),
+        lambda: session.exec(
+            select(func.count(QuestionDB.id)).where(QuestionDB.bank_id == bank_id)
+        ).one(),
+    )
+    # lambda_stmt caches the built statement per call site; the closure values become bind params
+    stmt = lambda_stmt(
+        lambda: select(
+            *_QUESTION_COLUMNS,
+            QuestionDB.created_at,
+            # correlated EXISTS served by the (user_id, question_id) unique index
+            exists()
+            .where(FavoriteQuestion.user_id == user_id, FavoriteQuestion.question_id == QuestionDB.id)
+            .label("is_favorited"),
+        )
+        .where(QuestionDB.bank_id == bank_id)
+        .order_by(QuestionDB.created_at.desc(), QuestionDB.id.desc())
+    )
+    if cursor is not None:
+        # seek past the previous page instead of scanning and discarding OFFSET rows
+        cursor_at, cursor_id = cursor
+        stmt += lambda s: s.where(
+            tuple_(QuestionDB.created_at, QuestionDB.id) < tuple_(cursor_at, cursor_id)
+        )
+    else:
+        offset = (page - 1) * page_size
+        stmt += lambda s: s.offset(offset)
+    limit = page_size + 1
+    stmt += lambda s: s.limit(limit)
+    rows = session.execute(stmt).all()
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = _encode_cursor(rows[-1].created_at, rows[-1].id)
+    return {
+        "items": [_to_payload(q, q.is_favorited) for q in rows],
+        "total": total_count,
+        "page": page,
+        "page_size": page_size,
+        "next_cursor": next_cursor,
+    }
+
+
+def _invalidate_banks(*bank_ids: int) -> None:
+    """Drop cached question lists for these banks and every favourites list."""
+    response_cache.bump("questions", *(f"bank:{bank_id}" for bank_id in set(bank_ids)))
+
+
+@router.get("/", responses={200: {"model": schemas.PaginatedQuestions}})
+def list_questions(
     bank_id: int = Query(..., description="题库 ID"),
     page: int = Query(1, ge=1, description="页码，从 1 开始"),
     page_size: int = Query(10, ge=1, le=100, description="每页数量，默认 10"),
+    cursor: str | None = Query(None, description="上一页返回的 next_cursor，传入后忽略 page"),
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
-) -> schemas.PaginatedQuestions:
+) -> Response:
     _ensure_bank_readable(session, bank_id, current_user)
-    total_stmt = select(func.count(QuestionDB.id)).where(QuestionDB.bank_id == bank_id)
-    total_result = session.exec(total_stmt).one_or_none()
-    if isinstance(total_result, tuple):
-        total_count = total_result[0] or 0
-    else:
-        total_count = total_result or 0
-    rows = session.exec(
-        select(QuestionDB)
-        .where(QuestionDB.bank_id == bank_id)
-        .order_by(QuestionDB.created_at.desc(), QuestionDB.id.desc())
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-    ).all()
-    question_ids = [q.id for q in rows]
-    fav_ids: set[int] = set()
-    if question_ids:
-        fav_ids = {
-            qid
-            for qid in session.exec(
-                select(FavoriteQuestion.question_id).where(
-                    FavoriteQuestion.user_id == current_user.id,
-                    FavoriteQuestion.question_id.in_(question_ids),
-                )
-            ).all()
-        }
-    result: list[schemas.Question] = []
-    for q in rows:
-        item = _to_schema(q)
-        item.is_favorited = q.id in fav_ids
-        result.append(item)
-    return schemas.PaginatedQuestions(items=result, total=total_count, page=page, page_size=page_size)
+    seek = _decode_cursor(cursor) if cursor else None
+    return response_cache.json_response(
+        f"questions:{bank_id}:{current_user.id}:{cursor or page}:{page_size}",
+        (f"bank:{bank_id}", f"fav:{current_user.id}"),
+        lambda: _question_page(session, bank_id, page, page_size, current_user.id, seek),
+    )
 
 
 @router.post("/manual", response_model=schemas.Question, status_code=201)
-async def create_manual_question(
+def create_manual_question(
     payload: schemas.ManualQuestionRequest,
     session: Session = Depends(get_session),
     admin: User = Depends(require_admin),
 ) -> schemas.Question:
     _ensure_bank(session, payload.bank_id)
-    created = _create_question(session, payload)
-    return _to_schema(created)
+    created = _create_questions(session, [payload])
+    result = _to_schema(created[0])
+    session.commit()
+    _invalidate_banks(payload.bank_id)
+    return result
 
 
 @router.put("/{question_id}", response_model=schemas.Question)
-async def update_question(
+def update_question(
     question_id: int,
     payload: schemas.QuestionUpdate,
     session: Session = Depends(get_session),
     admin: User = Depends(require_admin),
 ) -> schemas.Question:
-    question = session.get(QuestionDB, question_id)
-    if not question:
+    # explicit nulls are ignored, same as omitted fields
+    values = payload.model_dump(exclude_unset=True, exclude_none=True)
+    previous = aliased(QuestionDB)
+    if values:
+        # UPDATE ... FROM a self-alias: RETURNING sees the old row through the alias and the new one
+        # through the target, so a bank move is known without a SELECT first
+        stmt = (
+            update(QuestionDB)
+            .where(QuestionDB.id == question_id, previous.id == QuestionDB.id)
+            .values(**values)
+            .returning(previous.bank_id.label("previous_bank_id"), *_QUESTION_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        stmt = select(QuestionDB.bank_id.label("previous_bank_id"), *_QUESTION_COLUMNS).where(
+            QuestionDB.id == question_id
+        )
+    row = session.execute(stmt).one_or_none()
+    if row is None:
         raise HTTPException(status_code=404, detail="Question not found")
-    update_data = payload.model_dump(exclude_none=True)
-    if "options" in update_data and update_data["options"] is not None:
-        normalized_opts = []
-        for opt in update_data["options"]:
-            if hasattr(opt, "model_dump"):
-                normalized_opts.append(opt.model_dump())
-            elif isinstance(opt, dict):
-                normalized_opts.append({"key": opt.get("key"), "text": opt.get("text")})
-        update_data["options"] = normalized_opts
-    for field, value in update_data.items():
-        setattr(question, field, value)
-    session.add(question)
     session.commit()
-    session.refresh(question)
-    return _to_schema(question)
+    _invalidate_banks(row.previous_bank_id, row.bank_id)
+    return _to_schema(row)
 
 
 @router.delete("/{question_id}", status_code=204)
-async def delete_question(
+def delete_question(
     question_id: int,
     session: Session = Depends(get_session),
     admin: User = Depends(require_admin),
@@ -175,67 +296,88 @@ async def delete_question(
     question = session.get(QuestionDB, question_id)
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
+    bank_id = question.bank_id
     session.delete(question)
     session.commit()
+    _invalidate_banks(bank_id)
     return None
 
 
-@router.post("/ai/text-to-quiz", response_model=list[schemas.Question])
-async def text_to_quiz(
+@router.post("/ai/text-to-quiz", responses={200: {"model": list[schemas.Question]}})
+def text_to_quiz(
     payload: schemas.AIQuizRequest,
     session: Session = Depends(get_session),
     admin: User = Depends(require_admin),
-) -> list[schemas.Question]:
+) -> ORJSONResponse:
     _ensure_bank(session, payload.bank_id)
-    created: list[QuestionDB] = []
-    for question_payload in generate_questions_from_text(payload.text, payload.bank_id):
-        created.append(_create_question(session, question_payload))
-    return [_to_schema(q) for q in created]
+    created = _create_questions(
+        session, generate_questions_from_text(payload.text, payload.bank_id)
+    )
+    result = [_to_payload(q) for q in created]
+    session.commit()
+    _invalidate_banks(payload.bank_id)
+    return ORJSONResponse(result)
 
 
-@router.post("/ai/image-to-quiz", response_model=list[schemas.Question])
+@router.post("/ai/image-to-quiz", responses={200: {"model": list[schemas.Question]}})
 async def image_to_quiz(
     payload: schemas.AIImageQuizRequest,
     session: Session = Depends(get_session),
     admin: User = Depends(require_admin),
-) -> list[schemas.Question]:
-    _ensure_bank(session, payload.bank_id)
-    created: list[QuestionDB] = []
+) -> ORJSONResponse:
+    # async for the Gemini call; the blocking DB work around it goes to a worker thread
+    await asyncio.to_thread(_ensure_bank, session, payload.bank_id)
     try:
-        generated = await ai_service.generate_questions_from_image(
-            image_base64=payload.image_base64, bank_id=payload.bank_id
-        )
+        result = await _import_image(session, payload)
     except AIServiceError as exc:
         logger.error("Gemini 调用失败: %s", exc)
         raise HTTPException(status_code=502, detail=str(exc))
-    for question_payload in generated:
-        created.append(_create_question(session, question_payload))
-    return [_to_schema(q) for q in created]
+    await asyncio.to_thread(_invalidate_banks, payload.bank_id)
+    return ORJSONResponse(result)
+
+
+async def _import_image(session: Session, payload: schemas.AIImageQuizRequest) -> list[dict[str, Any]]:
+    generated = await ai_service.generate_questions_from_image(
+        image_base64=payload.image_base64, bank_id=payload.bank_id
+    )
+
+    def persist() -> list[dict[str, Any]]:
+        created = _create_questions(session, generated)
+        result = [_to_payload(q) for q in created]
+        session.commit()
+        return result
+
+    return await asyncio.to_thread(persist)
 
 
-@router.get("/favorites", response_model=list[schemas.Question])
-async def list_favorite_questions(
+@router.get("/favorites", responses={200: {"model": list[schemas.Question]}})
+def list_favorite_questions(
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
-) -> list[schemas.Question]:
-    stmt = (
-        select(QuestionDB)
-        .join(FavoriteQuestion, FavoriteQuestion.question_id == QuestionDB.id)
-        .where(FavoriteQuestion.user_id == current_user.id)
+) -> Response:
+    def build() -> list[dict[str, Any]]:
+        # drive the join from the user's favourites so the (user_id, question_id) index picks the rows
+        stmt = (
+            select(*_QUESTION_COLUMNS)
+            .select_from(FavoriteQuestion)
+            .join(QuestionDB, QuestionDB.id == FavoriteQuestion.question_id)
+            .where(FavoriteQuestion.user_id == current_user.id)
+            .execution_options(yield_per=200)
+        )
+        if current_user.role != "admin":
+            stmt = stmt.join(Bank, Bank.id == QuestionDB.bank_id).where(Bank.is_public.is_(True))
+        # stream rows straight into payloads instead of buffering the full result first
+        return [_to_payload(q, is_favorited=True) for q in session.exec(stmt)]
+
+    return response_cache.json_response(
+        f"favorites:{current_user.id}:{current_user.role}",
+        ("questions", f"fav:{current_user.id}"),
+        build,
     )
-    if current_user.role != "admin":
-        stmt = stmt.join(Bank, Bank.id == QuestionDB.bank_id).where(Bank.is_public.is_(True))
-    favorites = session.exec(stmt).all()
-    result: list[schemas.Question] = []
-    for q in favorites:
-        item = _to_schema(q)
-        item.is_favorited = True
-        result.append(item)
-    return result
 
 
 @router.post("/{question_id}/favorite", status_code=204)
-async def add_favorite_question(
+def add_favorite_question(
     question_id: int,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
@@ -243,54 +385,40 @@ async def add_favorite_question(
     question = session.get(QuestionDB, question_id)
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
-    exists = session.exec(
-        select(FavoriteQuestion).where(
-            FavoriteQuestion.user_id == current_user.id, FavoriteQuestion.question_id == question_id
-        )
-    ).first()
-    if not exists:
-        session.add(FavoriteQuestion(user_id=current_user.id, question_id=question_id))
-        session.commit()
+    session.exec(
+        pg_insert(FavoriteQuestion)
+        .values(user_id=current_user.id, question_id=question_id)
+        .on_conflict_do_nothing(index_elements=["user_id", "question_id"])
+    )
+    session.commit()
+    response_cache.bump(f"fav:{current_user.id}")
     return None
 
 
 @router.delete("/{question_id}/favorite", status_code=204)
-async def remove_favorite_question(
+def remove_favorite_question(
     question_id: int,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ) -> None:
-    favorite = session.exec(
-        select(FavoriteQuestion).where(
+    result = session.exec(
+        delete(FavoriteQuestion).where(
             FavoriteQuestion.user_id == current_user.id, FavoriteQuestion.question_id == question_id
         )
-    ).first()
-    if favorite:
-        session.delete(favorite)
+    )
+    if result.rowcount:
         session.commit()
+        response_cache.bump(f"fav:{current_user.id}")
     return None
 
 
-@router.get("/admin/{question_id}", response_model=schemas.Question)
-async def admin_get_question_by_id(
-    question_id: int,
-    session: Session = Depends(get_session),
-    _: User = Depends(require_admin),
-) -> schemas.Question:
-    """Admin-only: load a question by id quickly."""
-    question = session.get(QuestionDB, question_id)
-    if not question:
-        raise HTTPException(status_code=404, detail="Question not found")
-    return _to_schema(question)
-
-
-@router.get("/admin/search", response_model=list[schemas.Question])
-async def admin_search_questions(
+@router.get("/admin/search", responses={200: {"model": list[schemas.Question]}})
+def admin_search_questions(
     keyword: str | None = Query(None, description="关键字，模糊匹配题干和答案"),
     limit: int = Query(50, description="返回数量上限", ge=1, le=500),
     session: Session = Depends(get_session),
     _: User = Depends(require_admin),
-) -> list[schemas.Question]:
+) -> ORJSONResponse:
     if not keyword or not keyword.strip():
         raise HTTPException(status_code=400, detail="缺少关键字")
     pattern = f"%{keyword.strip()}%"
@@ -305,49 +433,93 @@ async def admin_search_questions(
         .limit(limit)
     )
     rows = session.exec(stmt).all()
-    return [_to_schema(q) for q in rows]
+    return ORJSONResponse([_to_payload(q) for q in rows])
 
 
-@router.get("/admin/issues", response_model=list[schemas.Question])
-async def admin_list_issue_logs(
+@router.get("/admin/issues", responses={200: {"model": list[schemas.QuestionIssueWithQuestion]}})
+def admin_list_issue_logs(
     session: Session = Depends(get_session),
     _: User = Depends(require_admin),
-) -> list[schemas.QuestionIssueWithQuestion]:
+) -> ORJSONResponse:
     """Admin-only: list issue records from DB, with question details."""
-    issues = session.exec(select(QuestionIssue).order_by(QuestionIssue.created_at.desc())).all()
-    results: list[schemas.QuestionIssueWithQuestion] = []
-    for issue in issues:
-        q = session.get(QuestionDB, issue.question_id)
-        if q:
-            results.append(
-                schemas.QuestionIssueWithQuestion(
-                    **issue.model_dump(),
-                    question=_to_schema(q),
-                )
-            )
-    return results
+    rows = session.exec(
+        select(QuestionIssue, QuestionDB)
+        .join(QuestionDB, QuestionDB.id == QuestionIssue.question_id)
+        .order_by(QuestionIssue.created_at.desc())
+    ).all()
+    return ORJSONResponse(
+        [
+            {
+                "id": issue.id,
+                "question_id": issue.question_id,
+                "bank_id": issue.bank_id,
+                "reason": issue.reason,
+                "status": issue.status,
+                "created_at": issue.created_at,
+                "question": _to_payload(q),
+            }
+            for issue, q in rows
+        ]
+    )
 
 
 @router.patch("/admin/issues/{issue_id}", response_model=schemas.QuestionIssueWithQuestion)
-async def admin_update_issue(
+def admin_update_issue(
     issue_id: int,
     payload: schemas.QuestionIssueUpdate,
     session: Session = Depends(get_session),
     _: User = Depends(require_admin),
 ) -> schemas.QuestionIssueWithQuestion:
-    issue = session.get(QuestionIssue, issue_id)
-    if not issue:
-        raise HTTPException(status_code=404, detail="Issue not found")
-    issue.status = payload.status
+    values = {"status": payload.status}
     if payload.reason is not None:
-        issue.reason = payload.reason
-    session.add(issue)
+        values["reason"] = payload.reason
+    # the UPDATE runs as a CTE left-joined to its question: one round trip, and the status
+    # change still lands when the question has since been deleted
+    updated = (
+        update(QuestionIssue)
+        .where(QuestionIssue.id == issue_id)
+        .values(**values)
+        .returning(
+            QuestionIssue.id.label("issue_id"),
+            QuestionIssue.question_id,
+            QuestionIssue.bank_id.label("issue_bank_id"),
+            QuestionIssue.reason,
+            QuestionIssue.status,
+            QuestionIssue.created_at,
+        )
+        .cte("updated_issue")
+    )
+    row = session.execute(
+        select(updated, *_QUESTION_COLUMNS).outerjoin(QuestionDB, QuestionDB.id == updated.c.question_id)
+    ).one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Issue not found")
     session.commit()
-    session.refresh(issue)
-    question = session.get(QuestionDB, issue.question_id)
+    if row.id is None:
+        raise HTTPException(status_code=404, detail="Question not found")
+    return schemas.QuestionIssueWithQuestion.model_construct(
+        id=row.issue_id,
+        question_id=row.question_id,
+        bank_id=row.issue_bank_id,
+        reason=row.reason,
+        status=row.status,
+        created_at=row.created_at,
+        question=_to_schema(row),
+    )
+
+
+@router.get("/admin/{question_id}", responses={200: {"model": schemas.Question}})
+def admin_get_question_by_id(
+    question_id: int,
+    session: Session = Depends(get_session),
+    _: User = Depends(require_admin),
+) -> ORJSONResponse:
+    """Admin-only: load a question by id quickly."""
+    question = session.get(QuestionDB, question_id)
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
-    return schemas.QuestionIssueWithQuestion(**issue.model_dump(), question=_to_schema(question))
+    return ORJSONResponse(_to_payload(question))
+
 
 @router.post("/ai/batch-import", response_model=schemas.BatchImportResponse)
 async def batch_import(
@@ -355,9 +527,132 @@ async def batch_import(
     session: Session = Depends(get_session),
     admin: User = Depends(require_admin),
 ) -> schemas.BatchImportResponse:
-    _ensure_bank(session, payload.bank_id)
+    await asyncio.to_thread(_ensure_bank, session, payload.bank_id)
     importer = BatchImportService(session=session, ai=ai_service)
     try:
         return await importer.import_directory(payload)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from None
+    finally:
+        # the importer commits as it goes, so partial imports must invalidate too
+        await asyncio.to_thread(_invalidate_banks, payload.bank_id)
+
+
+def _job_status(job: ImportJob) -> dict[str, Any]:
+    return {
+        "job_id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "result": job.result,
+        "error": job.error,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+    }
+
+
+def _submit_job(
+    session: Session,
+    background_tasks: BackgroundTasks,
+    kind: str,
+    bank_id: int,
+    user: User,
+    work: Callable[[Session], Awaitable[Any]],
+) -> ORJSONResponse:
+    job = ImportJob(id=uuid4().hex, kind=kind, bank_id=bank_id, user_id=user.id)
+    session.add(job)
+    session.commit()
+    background_tasks.add_task(_run_job, job.id, bank_id, work)
+    return ORJSONResponse(_job_status(job), status_code=202)
+
+
+async def _run_job(job_id: str, bank_id: int, work: Callable[[Session], Awaitable[Any]]) -> None:
+    # runs after the response is sent, so it needs its own session rather than the request's;
+    # only the import itself is awaited on the event loop, the bookkeeping goes to worker threads
+    with SessionLocal() as session:
+        await asyncio.to_thread(_update_job, session, job_id, status="running")
+        try:
+            result = await work(session)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Import job %s failed", job_id)
+            await asyncio.to_thread(_update_job, session, job_id, status="failed", error=str(exc))
+        else:
+            await asyncio.to_thread(_update_job, session, job_id, status="succeeded", result=result)
+        finally:
+            await asyncio.to_thread(_invalidate_banks, bank_id)
+
+
+def _update_job(session: Session, job_id: str, **values: Any) -> None:
+    # drop whatever a failed import left in the transaction before recording the outcome
+    session.rollback()
+    session.execute(update(ImportJob).where(ImportJob.id == job_id).values(**values))
+    session.commit()
+
+
+def fail_stale_jobs(session: Session, job_id: str | None = None) -> None:
+    """Mark pending/running jobs as failed once they have not moved for IMPORT_JOB_TIMEOUT.
+
+    A job's task lives in the worker that accepted it, so a restart or crash leaves its row
+    behind; this runs at startup and before a job's status is reported.
+    """
+    stmt = update(ImportJob).where(
+        ImportJob.status.in_(("pending", "running")),
+        ImportJob.updated_at
+        < func.timezone("utc", func.clock_timestamp()) - timedelta(seconds=settings.import_job_timeout),
+    )
+    if job_id is not None:
+        stmt = stmt.where(ImportJob.id == job_id)
+    session.execute(stmt.values(status="failed", error="任务已中断（服务重启或超时）"))
+    session.commit()
+
+
+@router.post(
+    "/ai/image-to-quiz/jobs", status_code=202, responses={202: {"model": schemas.ImportJobStatus}}
+)
+def submit_image_to_quiz_job(
+    payload: schemas.AIImageQuizRequest,
+    background_tasks: BackgroundTasks,
+    session: Session = Depends(get_session),
+    admin: User = Depends(require_admin),
+) -> ORJSONResponse:
+    """Queue an image import and return immediately; poll GET /ai/jobs/{job_id} for the result."""
+    _ensure_bank(session, payload.bank_id)
+    return _submit_job(
+        session,
+        background_tasks,
+        "image_to_quiz",
+        payload.bank_id,
+        admin,
+        lambda job_session: _import_image(job_session, payload),
+    )
+
+
+@router.post(
+    "/ai/batch-import/jobs", status_code=202, responses={202: {"model": schemas.ImportJobStatus}}
+)
+def submit_batch_import_job(
+    payload: schemas.BatchImportRequest,
+    background_tasks: BackgroundTasks,
+    session: Session = Depends(get_session),
+    admin: User = Depends(require_admin),
+) -> ORJSONResponse:
+    """Queue a directory import and return immediately; poll GET /ai/jobs/{job_id} for the result."""
+    _ensure_bank(session, payload.bank_id)
+
+    async def work(job_session: Session) -> dict[str, Any]:
+        importer = BatchImportService(session=job_session, ai=ai_service)
+        return (await importer.import_directory(payload)).model_dump(mode="json")
+
+    return _submit_job(session, background_tasks, "batch_import", payload.bank_id, admin, work)
+
+
+@router.get("/ai/jobs/{job_id}", responses={200: {"model": schemas.ImportJobStatus}})
+def get_import_job(
+    job_id: str,
+    session: Session = Depends(get_session),
+    admin: User = Depends(require_admin),
+) -> ORJSONResponse:
+    fail_stale_jobs(session, job_id)
+    job = session.get(ImportJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return ORJSONResponse(_job_status(job))
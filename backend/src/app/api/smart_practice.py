@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
 from sqlmodel import Session
 
 from app.db import get_session
@@ -12,15 +14,20 @@ from app.services import smart_practice_service
 router = APIRouter(redirect_slashes=False)
 
 
-@router.get("/status", response_model=schemas.SmartPracticeStatus)
-async def get_status(
+def _json(model: BaseModel) -> ORJSONResponse:
+    # Service results are already validated models; skip FastAPI's response_model pass.
+    return ORJSONResponse(model.model_dump(mode="json"))
+
+
+@router.get("/status", responses={200: {"model": schemas.SmartPracticeStatus}})
+def get_status(
     session: Session = Depends(get_session), current_user: User = Depends(get_current_user)
-) -> schemas.SmartPracticeStatus:
-    return smart_practice_service.get_status(session, current_user)
+) -> ORJSONResponse:
+    return _json(smart_practice_service.get_status(session, current_user))
 
 
 @router.get("/settings", response_model=schemas.SmartPracticeSettingsResponse | None)
-async def get_settings(
+def get_settings(
     session: Session = Depends(get_session), current_user: User = Depends(get_current_user)
 ) -> schemas.SmartPracticeSettingsResponse | None:
     settings = smart_practice_service.get_latest_settings(session, current_user.id)
@@ -28,7 +35,7 @@ async def get_settings(
 
 
 @router.put("/settings", response_model=schemas.SmartPracticeSettingsResponse)
-async def save_settings(
+def save_settings(
     payload: schemas.SmartPracticeSettingsPayload,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
@@ -36,54 +43,58 @@ async def save_settings(
     return smart_practice_service.save_settings(session, payload, current_user)
 
 
-@router.post("/session/start", response_model=schemas.SmartPracticeGroup)
-async def start_session(
+@router.post("/session/start", responses={200: {"model": schemas.SmartPracticeGroup}})
+def start_session(
     session: Session = Depends(get_session), current_user: User = Depends(get_current_user)
-) -> schemas.SmartPracticeGroup:
-    return smart_practice_service.start_session(session, current_user)
+) -> ORJSONResponse:
+    return _json(smart_practice_service.start_session(session, current_user))
 
 
-@router.get("/session/{session_id}/current", response_model=schemas.SmartPracticeGroup)
-async def get_current_group(
+@router.get("/session/{session_id}/current", responses={200: {"model": schemas.SmartPracticeGroup}})
+def get_current_group(
     session_id: str,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
-) -> schemas.SmartPracticeGroup:
-    return smart_practice_service.get_current_group(session, session_id, current_user)
+) -> ORJSONResponse:
+    return _json(
+        smart_practice_service.get_current_group(session, session_id, current_user)
+    )
 
 
-@router.post("/session/{session_id}/answer", response_model=schemas.SmartPracticeAnswerResponse)
-async def answer_question(
+@router.post("/session/{session_id}/answer", responses={200: {"model": schemas.SmartPracticeAnswerResponse}})
+def answer_question(
     session_id: str,
     payload: schemas.SmartPracticeAnswerRequest,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
-) -> schemas.SmartPracticeAnswerResponse:
-    return smart_practice_service.answer_question(session, session_id, payload, current_user)
+) -> ORJSONResponse:
+    return _json(
+        smart_practice_service.answer_question(session, session_id, payload, current_user)
+    )
 
 
-@router.post("/session/{session_id}/toggle-analysis", response_model=schemas.SmartPracticeStatus)
-async def toggle_analysis(
+@router.post("/session/{session_id}/toggle-analysis", responses={200: {"model": schemas.SmartPracticeStatus}})
+def toggle_analysis(
     session_id: str,
     payload: schemas.SmartPracticeToggleRequest,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
-) -> schemas.SmartPracticeStatus:
+) -> ORJSONResponse:
     sp_session = smart_practice_service.toggle_realtime_analysis(session, session_id, payload.realtime_analysis, current_user)
-    return smart_practice_service.get_status(session, current_user)
+    return _json(smart_practice_service.get_status(session, current_user))
 
 
-@router.post("/session/{session_id}/next-group", response_model=schemas.SmartPracticeGroup)
-async def next_group(
+@router.post("/session/{session_id}/next-group", responses={200: {"model": schemas.SmartPracticeGroup}})
+def next_group(
     session_id: str,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
-) -> schemas.SmartPracticeGroup:
-    return smart_practice_service.next_group(session, session_id, current_user)
+) -> ORJSONResponse:
+    return _json(smart_practice_service.next_group(session, session_id, current_user))
 
 
 @router.post("/session/{session_id}/finish", response_model=dict)
-async def finish_session(
+def finish_session(
     session_id: str,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
@@ -93,7 +104,7 @@ async def finish_session(
 
 
 @router.post("/session/{session_id}/feedback", response_model=dict)
-async def feedback_and_skip(
+def feedback_and_skip(
     session_id: str,
     payload: schemas.SmartPracticeFeedbackRequest,
     session: Session = Depends(get_session),
@@ -104,7 +115,7 @@ async def feedback_and_skip(
 
 
 @router.delete("/session/reset", response_model=dict)
-async def reset_session_state(
+def reset_session_state(
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ) -> dict:
@@ -1,106 +1,148 @@
 import random
-from collections import defaultdict
-
-from collections import defaultdict
-
-from fastapi import APIRouter, Depends, HTTPException, Query
+import re
+from functools import lru_cache
+from itertools import groupby
+from operator import attrgetter
+from typing import Iterable
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import Label, Row, Select, exists, func, insert, literal
 from sqlmodel import Session, select
 
-from app.dependencies import get_current_user
+from app.dependencies import bank_visibility, get_current_user
 from app.db import get_session
 from app.models import schemas
 from app.models.db_models import Bank, FavoriteQuestion, Question as QuestionDB, StudySession, User, WrongRecord
 
 router = APIRouter(redirect_slashes=False)
 
+_WRONG_LIST_ADAPTER = TypeAdapter(list[schemas.WrongQuestionSummary])
+
 
 def _ensure_bank_readable(session: Session, bank_id: int, user: User) -> None:
-    bank = session.get(Bank, bank_id)
-    if not bank:
+    is_public = bank_visibility(session, bank_id)
+    if is_public is None:
         raise HTTPException(status_code=404, detail="Bank not found")
-    if user.role != "admin" and not bank.is_public:
+    if user.role != "admin" and not is_public:
         raise HTTPException(status_code=403, detail="无权访问非公开题库")
 
 
-def _to_study_question(q: QuestionDB) -> schemas.StudyQuestion:
-    return schemas.StudyQuestion(
-        id=q.id, content=q.content, type=q.type, options=[schemas.Option(**opt) for opt in q.options or []]
+# columns read by _to_study_question; the favourite flag is selected alongside them
+_STUDY_COLUMNS = (
+    QuestionDB.id,
+    QuestionDB.content,
+    QuestionDB.type,
+    QuestionDB.options,
+    QuestionDB.standard_answer,
+    QuestionDB.analysis,
+)
+
+
+def _is_favorited(user_id: int) -> Label[bool]:
+    return (
+        exists()
+        .where(FavoriteQuestion.user_id == user_id, FavoriteQuestion.question_id == QuestionDB.id)
+        .label("is_favorited")
+    )
+
+
+# the converters below read rows straight from our own tables, so they skip validation
+def _to_study_question(q: QuestionDB | Row, is_favorited: bool = False) -> schemas.StudyQuestion:
+    return schemas.StudyQuestion.model_construct(
+        id=q.id,
+        content=q.content,
+        type=q.type,
+        options=schemas.stored_options(q.options),
+        standard_answer=q.standard_answer,
+        analysis=q.analysis,
+        is_favorited=is_favorited,
     )
 
 
 def _to_question(q: QuestionDB) -> schemas.Question:
-    return schemas.Question(
+    return schemas.Question.model_construct(
         id=q.id,
         bank_id=q.bank_id,
         type=q.type,
         content=q.content,
-        options=[schemas.Option(**opt) for opt in q.options or []],
+        options=schemas.stored_options(q.options),
         standard_answer=q.standard_answer,
         analysis=q.analysis,
     )
 
 
-def _wrong_question_ids(session: Session, user_id: int) -> set[int]:
-    records = (
-        session.exec(
-            select(WrongRecord)
-            .where(WrongRecord.user_id == user_id)
-            .order_by(WrongRecord.question_id, WrongRecord.created_at.desc())
-        ).all()
+def _is_still_wrong(outcomes: Iterable[bool]) -> bool:
+    """Newest-first results for one question: wrong until answered right 3 times since the last miss."""
+    for streak, is_correct in enumerate(outcomes):
+        if not is_correct:
+            return streak < 3
+    return False
+
+
+def _wrong_question_ids(user_id: int) -> Select:
+    """Ids of questions still wrong for the user, as a subquery.
+
+    SQL form of ``_is_still_wrong``: a question stays wrong while one of its three most
+    recent records is a miss.
+    """
+    ranked = (
+        select(
+            WrongRecord.question_id,
+            WrongRecord.is_correct,
+            func.row_number()
+            .over(partition_by=WrongRecord.question_id, order_by=WrongRecord.created_at.desc())
+            .label("rn"),
+        )
+        .where(WrongRecord.user_id == user_id)
+        .subquery()
     )
-    grouped: dict[int, list[WrongRecord]] = defaultdict(list)
-    for rec in records:
-        grouped[rec.question_id].append(rec)
-
-    wrong_ids: set[int] = set()
-    for qid, recs in grouped.items():
-        consecutive_correct = 0
-        ever_wrong = False
-        for rec in recs:
-            if rec.is_correct:
-                consecutive_correct += 1
-            else:
-                ever_wrong = True
-                break
-        if ever_wrong:
-            if consecutive_correct < 3:
-                wrong_ids.add(qid)
-    return wrong_ids
+    return select(ranked.c.question_id).where(ranked.c.rn <= 3, ranked.c.is_correct.is_(False))
 
 
 def _collect_wrong_summaries(session: Session, user_id: int) -> list[schemas.WrongQuestionSummary]:
-    records = (
-        session.exec(
-            select(WrongRecord)
-            .where(WrongRecord.user_id == user_id)
-            .order_by(WrongRecord.question_id, WrongRecord.created_at.desc())
-        ).all()
+    # one pass over the user's records joined to their questions: the newest record per question
+    # supplies the summary, the whole group decides whether it is still wrong
+    records = session.exec(
+        select(
+            WrongRecord.question_id,
+            WrongRecord.user_answer,
+            WrongRecord.correct_answer,
+            WrongRecord.is_correct,
+            WrongRecord.created_at,
+            QuestionDB.id,
+            QuestionDB.bank_id,
+            QuestionDB.type,
+            QuestionDB.content,
+            QuestionDB.options,
+            QuestionDB.standard_answer,
+            QuestionDB.analysis,
+        )
+        .join(QuestionDB, QuestionDB.id == WrongRecord.question_id)
+        .where(WrongRecord.user_id == user_id)
+        .order_by(WrongRecord.question_id, WrongRecord.created_at.desc())
+        .execution_options(yield_per=1000)
     )
-    latest: dict[int, WrongRecord] = {}
-    for rec in records:
-        if rec.question_id not in latest:
-            latest[rec.question_id] = rec
-
-    wrong_ids = _wrong_question_ids(session, user_id)
     summaries: list[schemas.WrongQuestionSummary] = []
-    for qid in wrong_ids:
-        record = latest.get(qid)
-        question = session.get(QuestionDB, qid)
-        if not question or not record:
+    for _, recs in groupby(records, key=attrgetter("question_id")):
+        recs = list(recs)
+        if not _is_still_wrong(rec.is_correct for rec in recs):
             continue
+        latest = recs[0]
         summaries.append(
-            schemas.WrongQuestionSummary(
-                question=_to_question(question),
-                user_answer=record.user_answer,
-                correct_answer=record.correct_answer,
-                created_at=record.created_at,
+            schemas.WrongQuestionSummary.model_construct(
+                question=_to_question(latest),
+                user_answer=latest.user_answer,
+                correct_answer=latest.correct_answer,
+                created_at=latest.created_at,
             )
         )
     return summaries
 
 
 @router.post("/record", response_model=dict)
-async def record_answer(
+def record_answer(
     payload: schemas.SubmitAnswer,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
@@ -128,26 +170,30 @@ async def record_answer(
     return {"is_correct": is_correct}
 
 
+# 多选答案的分隔符：空格、中英文逗号
+_CHOICE_SEP_RE = re.compile(r"[ ,，]+")
+
+
+@lru_cache(maxsize=1024)
 def _normalize_answer(val: str, qtype: str) -> str:
     if qtype == "choice_multi":
         # 支持空格/中英文逗号等常见分隔，且兼容连续字母输入（如 "ABC"）
-        raw_parts = [p.strip().upper() for p in val.replace("，", ",").replace(" ", ",").split(",") if p.strip()]
+        raw_parts = [p.strip().upper() for p in _CHOICE_SEP_RE.split(val) if p.strip()]
         if len(raw_parts) == 1 and len(raw_parts[0]) > 1 and raw_parts[0].isalpha():
             raw_parts = list(raw_parts[0])
-        parts = sorted({p for p in raw_parts if p})
-        return ",".join(parts)
+        return ",".join(sorted(set(raw_parts)))
     return val.strip().upper()
 
 
-@router.get("/session/start", response_model=schemas.StartSessionResponse)
-async def start_session(
+@router.get("/session/start", responses={200: {"model": schemas.StartSessionResponse}})
+def start_session(
     bank_id: int | None = Query(None, description="题库 ID"),
     mode: str = Query(
         "random", description="练习模式：random / ordered / wrong / favorite / memorize*"
     ),
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
-) -> schemas.StartSessionResponse:
+) -> ORJSONResponse:
     selection_mode = mode
     is_memorize = mode.startswith("memorize")
     if is_memorize:
@@ -163,15 +209,19 @@ async def start_session(
             raise HTTPException(status_code=400, detail="bank_id is required for this mode")
         if bank_id is not None:
             _ensure_bank_readable(session, bank_id, current_user)
-        query = select(QuestionDB)
+        query = select(*_STUDY_COLUMNS, _is_favorited(current_user.id))
         if bank_id is not None:
             query = query.where(QuestionDB.bank_id == bank_id)
         if current_user.role != "admin":
             query = query.join(Bank, Bank.id == QuestionDB.bank_id).where(Bank.is_public.is_(True))
+        if selection_mode == "wrong":
+            query = query.where(QuestionDB.id.in_(_wrong_question_ids(current_user.id)))
         questions = session.exec(query).all()
     else:
-        fav_query = select(QuestionDB).join(FavoriteQuestion, FavoriteQuestion.question_id == QuestionDB.id).where(
-            FavoriteQuestion.user_id == current_user.id
+        fav_query = (
+            select(*_STUDY_COLUMNS, literal(True).label("is_favorited"))
+            .join(FavoriteQuestion, FavoriteQuestion.question_id == QuestionDB.id)
+            .where(FavoriteQuestion.user_id == current_user.id)
         )
         if bank_id:
             fav_query = fav_query.where(QuestionDB.bank_id == bank_id)
@@ -179,47 +229,40 @@ async def start_session(
             fav_query = fav_query.join(Bank, Bank.id == QuestionDB.bank_id).where(Bank.is_public.is_(True))
         questions = session.exec(fav_query).all()
 
-    if selection_mode == "wrong":
-        wrong_ids = _wrong_question_ids(session, current_user.id)
-        questions = [q for q in questions if q.id in wrong_ids]
-
     if selection_mode == "random":
         random.shuffle(questions)
     else:
         questions.sort(key=lambda x: x.id)
 
-    fav_ids = {
-        fav.question_id
-        for fav in session.exec(
-            select(FavoriteQuestion).where(FavoriteQuestion.user_id == current_user.id)
-        ).all()
-    }
-    study_questions: list[schemas.StudyQuestion] = []
-    for q in questions:
-        base = _to_study_question(q).model_dump(exclude_none=True, exclude_defaults=True)
-        base.update(
-            standard_answer=q.standard_answer,
-            analysis=q.analysis,
-            is_favorited=q.id in fav_ids,
-        )
-        study_questions.append(schemas.StudyQuestion(**base))
-    return schemas.StartSessionResponse(
+    study_questions = [_to_study_question(q, q.is_favorited) for q in questions]
+    result = schemas.StartSessionResponse(
         session_id=f"session-{bank_id}-{mode}-{current_user.id}", questions=study_questions
     )
+    return ORJSONResponse(result.model_dump(mode="json"))
 
 
-@router.post("/submit", response_model=schemas.SubmitResult)
-async def submit(
+@router.post("/submit", responses={200: {"model": schemas.SubmitResult}})
+def submit(
     payload: schemas.SubmitRequest,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
-) -> schemas.SubmitResult:
+) -> ORJSONResponse:
     correct_count = 0
 
     answers_payload = []
+    session_answers = []
     bank_id = None
+    question_ids = {answer.question_id for answer in payload.answers}
+    questions = {
+        q.id: q
+        for q in session.exec(
+            select(QuestionDB.id, QuestionDB.bank_id, QuestionDB.type, QuestionDB.standard_answer).where(
+                QuestionDB.id.in_(question_ids)
+            )
+        )
+    }
     for answer in payload.answers:
-        question = session.get(QuestionDB, answer.question_id)
+        question = questions.get(answer.question_id)
         if question is None:
             raise HTTPException(status_code=404, detail=f"Question {answer.question_id} not found")
         _ensure_bank_readable(session, question.bank_id, current_user)
@@ -233,19 +276,21 @@ async def submit(
         if is_correct:
             correct_count += 1
 
-        record = WrongRecord(
-            user_id=current_user.id,
-            question_id=question.id,
-            user_answer=raw_answer,
-            correct_answer=raw_standard,
-            is_correct=is_correct,
+        answers_payload.append(
+            {
+                "user_id": current_user.id,
+                "question_id": question.id,
+                "user_answer": raw_answer,
+                "correct_answer": raw_standard,
+                "is_correct": is_correct,
+            }
         )
-        session.add(record)
-        answers_payload.append(record)
+        session_answers.append({"question_id": question.id, "user_answer": raw_answer, "is_correct": is_correct})
 
-    # persist streak logic via wrong records evaluation
-    session.commit()
-    wrong_items = _collect_wrong_summaries(session, current_user.id)
+    # persist streak logic via wrong records evaluation; one multi-row INSERT for the whole submission,
+    # committed together with the session summary below
+    if answers_payload:
+        session.execute(insert(WrongRecord), answers_payload)
 
     total = len(payload.answers)
     score = round((correct_count / total) * 100) if total else 0
@@ -256,31 +301,26 @@ async def submit(
             bank_id=bank_id or 0,
             mode=payload.session_id,
             score=score,
-            answers=[
-                {
-                    "question_id": rec.question_id,
-                    "user_answer": rec.user_answer,
-                    "is_correct": rec.is_correct,
-                }
-                for rec in answers_payload
-            ],
+            answers=session_answers,
         )
     )
     session.commit()
 
     wrong_items = _collect_wrong_summaries(session, current_user.id)
 
-    return schemas.SubmitResult(
+    result = schemas.SubmitResult(
         correct_count=correct_count,
         total=total,
         score=score,
         wrong_questions=wrong_items,
     )
+    return ORJSONResponse(result.model_dump(mode="json"))
 
 
-@router.get("/wrong", response_model=list[schemas.WrongQuestionSummary])
-async def list_wrong_questions(
+@router.get("/wrong", responses={200: {"model": list[schemas.WrongQuestionSummary]}})
+def list_wrong_questions(
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
-) -> list[schemas.WrongQuestionSummary]:
-    return _collect_wrong_summaries(session, current_user.id)
+) -> Response:
+    summaries = _collect_wrong_summaries(session, current_user.id)
+    return Response(_WRONG_LIST_ADAPTER.dump_json(summaries), media_type="application/json")
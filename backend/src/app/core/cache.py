@@ -0,0 +1,118 @@
+"""Redis-backed cache for serialized JSON responses.
+
+Cached keys embed the current value of one or more generation counters
+(e.g. ``bank:3``). Writes bump the counters instead of deleting keys, so
+invalidation is a single INCR and stale entries simply age out via TTL.
+When Redis is unreachable the cache is bypassed for a short while and
+requests fall through to the database.
+
+The client is synchronous, and a Redis that is slow to answer can hold a
+call for up to its socket timeout; async handlers therefore call into the
+cache through ``asyncio.to_thread``.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Callable, Sequence
+
+import orjson
+import redis
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "quiz:cache:"
+_RETRY_AFTER_SECONDS = 30.0
+
+
+class ResponseCache:
+    def __init__(self, url: str, ttl: int = 300) -> None:
+        self.ttl = ttl
+        self._client = redis.Redis.from_url(url, socket_connect_timeout=0.2, socket_timeout=0.5)
+        self._down_until = 0.0
+
+    def json_response(
+        self, key: str, generations: Sequence[str], build: Callable[[], Any]
+    ) -> Response:
+        """Serve ``key`` from the cache, or build, store and return the payload."""
+        body = self._get_or_build(key, generations, lambda: ORJSONResponse(build()).body)
+        return Response(body, media_type="application/json")
+
+    def count(self, key: str, generations: Sequence[str], build: Callable[[], int]) -> int:
+        """Cached integer, e.g. a ``COUNT(*)`` shared by every page of a listing."""
+        return int(self._get_or_build(key, generations, lambda: str(build()).encode()))
+
+    def json_value(
+        self,
+        key: str,
+        generations: Sequence[str],
+        build: Callable[[], Any],
+        ttl: int | None = None,
+    ) -> Any:
+        """Like :meth:`json_response` but returns the decoded value instead of a response."""
+        return orjson.loads(self._get_or_build(key, generations, lambda: orjson.dumps(build()), ttl))
+
+    def generation(self, name: str) -> str | None:
+        """Current value of one generation counter, or ``None`` while Redis is unreachable.
+
+        Lets per-process caches tag their entries and notice a bump from any worker.
+        """
+        versions = self._generations([name])
+        return versions[0] if versions is not None else None
+
+    def bump(self, *generations: str) -> None:
+        """Invalidate every entry built from the given generation counters."""
+        if not generations or not self._available():
+            return
+        pipe = self._client.pipeline(transaction=False)
+        for name in generations:
+            pipe.incr(f"{_KEY_PREFIX}gen:{name}")
+        self._call(pipe.execute)
+
+    def _get_or_build(
+        self,
+        key: str,
+        generations: Sequence[str],
+        build: Callable[[], bytes],
+        ttl: int | None = None,
+    ) -> bytes:
+        versions = self._generations(generations)
+        if versions is None:
+            return build()
+        full_key = f"{_KEY_PREFIX}{key}:{':'.join(versions)}"
+        cached = self._call(self._client.get, full_key)
+        if cached is not None:
+            return cached
+        value = build()
+        if self._available():
+            self._call(self._client.set, full_key, value, ex=ttl or self.ttl)
+        return value
+
+    def _generations(self, names: Sequence[str]) -> list[str] | None:
+        if not self._available():
+            return None
+        if not names:
+            return []
+        values = self._call(self._client.mget, [f"{_KEY_PREFIX}gen:{n}" for n in names])
+        if values is None:
+            return None
+        return [v.decode() if v else "0" for v in values]
+
+    def _available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        try:
+            return fn(*args, **kwargs)
+        except redis.RedisError as exc:
+            logger.warning("Redis unavailable, bypassing response cache: %s", exc)
+            self._down_until = time.monotonic() + _RETRY_AFTER_SECONDS
+            return None
+
+
+response_cache = ResponseCache(settings.redis_url)
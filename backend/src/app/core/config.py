@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pathlib import Path
 
 from pydantic import AliasChoices, Field
@@ -14,6 +15,12 @@ class Settings(BaseSettings):
         description="SQLAlchemy-compatible database URL",
         validation_alias=AliasChoices("DATABASE_URL", "DB_URL"),
     )
+    db_pool_size: int = Field(default=10, validation_alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=10, validation_alias="DB_MAX_OVERFLOW")
+    db_pool_recycle: int = Field(default=3600, validation_alias="DB_POOL_RECYCLE")
+    db_pool_timeout: int = Field(default=30, validation_alias="DB_POOL_TIMEOUT")
+    # set when connecting through PgBouncer (transaction pooling), which does the pooling itself
+    db_external_pool: bool = Field(default=False, validation_alias="DB_EXTERNAL_POOL")
     redis_url: str = Field(default="redis://localhost:6379/0", validation_alias="REDIS_URL")
     secret_key: str = Field(default="change-me", validation_alias="SECRET_KEY")
     access_token_expire_minutes: int = Field(
@@ -29,6 +36,8 @@ class Settings(BaseSettings):
     )
     gemini_model: str = "gemini-2.5-flash"
     gemini_request_timeout: int = 40
+    # pending/running import jobs not updated for this long are treated as dead (worker restart or crash)
+    import_job_timeout: int = Field(default=3600, validation_alias="IMPORT_JOB_TIMEOUT")
     zai_api_key: str | None = Field(default=None, validation_alias="ZAI_API_KEY")
     zai_api_base: str | None = Field(default=None, validation_alias="ZAI_API_BASE")
     zai_model: str | None = Field(default=None, validation_alias="ZAI_MODEL")
@@ -38,4 +47,10 @@ class Settings(BaseSettings):
         env_file_encoding = "utf-8"
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, reading the environment only once."""
+    return Settings()
+
+
+settings = get_settings()
@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import base64
+import binascii
+import hashlib
+import hmac
+import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any, Optional
 
 from jose import JWTError, jwt
+from jose.exceptions import ExpiredSignatureError
 from passlib.context import CryptContext
 
 from app.core.config import settings
@@ -13,7 +20,22 @@ pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    # passlib format: $pbkdf2-sha256$<rounds>$<ab64 salt>$<ab64 digest>; verify it with hashlib
+    # directly and leave any other scheme to passlib
+    parts = hashed_password.split("$")
+    if len(parts) != 5 or parts[1] != "pbkdf2-sha256" or not parts[2].isdigit():
+        return pwd_context.verify(plain_password, hashed_password)
+    try:
+        salt, expected = _ab64_decode(parts[3]), _ab64_decode(parts[4])
+    except (binascii.Error, ValueError):
+        return False
+    digest = hashlib.pbkdf2_hmac("sha256", plain_password.encode("utf-8"), salt, int(parts[2]))
+    return hmac.compare_digest(digest, expected)
+
+
+def _ab64_decode(data: str) -> bytes:
+    # passlib's "adapted base64": standard alphabet with "." for "+" and no padding
+    return base64.b64decode(data.replace(".", "+") + "=" * (-len(data) % 4), validate=True)
 
 
 def get_password_hash(password: str) -> str:
@@ -31,4 +53,14 @@ def create_access_token(data: dict[str, Any], expires_minutes: Optional[int] = N
 
 
 def decode_token(token: str) -> dict[str, Any]:
+    claims = _verified_claims(token)
+    # cached entries outlive the token, so expiry is re-checked on every call
+    if claims.get("exp") is not None and claims["exp"] <= time.time():
+        raise ExpiredSignatureError("Signature has expired.")
+    return dict(claims)
+
+
+@lru_cache(maxsize=4096)
+def _verified_claims(token: str) -> dict[str, Any]:
+    # every authenticated request decodes the same few tokens; verify each signature once
     return jwt.decode(token, settings.secret_key, algorithms=["HS256"])
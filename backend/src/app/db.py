@@ -1,28 +1,90 @@
 from __future__ import annotations
 
+import logging
+from contextlib import ExitStack
 from typing import Generator
 
-from sqlalchemy import text
+import orjson
+from sqlalchemy import Column, Connection, DateTime, text
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from sqlmodel import Session, SQLModel, create_engine
 
 from app.core.config import settings
+from app.models.db_models import QuestionIssue, SmartPracticeGroup, SmartPracticeSession
 
-engine = create_engine(settings.database_url, echo=settings.debug)
+logger = logging.getLogger(__name__)
+
+if settings.db_external_pool:
+    # PgBouncer hands out a different server connection per transaction, so keep no pool here
+    # and turn off psycopg's server-side prepared statements, which would not survive the switch
+    _pool_options: dict = {"poolclass": NullPool, "connect_args": {"prepare_threshold": None}}
+else:
+    # Sized per worker process: sync endpoints run in FastAPI's threadpool, so the
+    # pool has to cover concurrent requests rather than the default 5 + 10.
+    _pool_options = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_pre_ping": True,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+
+
+def _json_dumps(value: object) -> str:
+    return orjson.dumps(value).decode()
+
+
+# JSON columns (question options, session answers, smart-practice snapshots) go through orjson
+engine = create_engine(
+    settings.database_url,
+    echo=settings.debug,
+    json_serializer=_json_dumps,
+    json_deserializer=orjson.loads,
+    **_pool_options,
+)
+SessionLocal = sessionmaker(bind=engine, class_=Session)
 
 
 def init_db() -> None:
     SQLModel.metadata.create_all(engine)
     _run_schema_patches()
+    _create_search_indexes()
+
+
+# per worker; enough for the first requests after a deploy without each worker
+# claiming its whole pool at startup
+_WARM_CONNECTIONS = 2
+
+
+def warm_pool() -> None:
+    """Best effort: open a couple of pooled connections up front so early requests skip the connect."""
+    if settings.db_external_pool:
+        return
+    try:
+        with ExitStack() as stack:
+            for _ in range(min(settings.db_pool_size, _WARM_CONNECTIONS)):
+                # held open together; connecting and closing one at a time would reuse a single slot
+                stack.enter_context(engine.connect())
+    except OperationalError as exc:
+        logger.warning("Could not warm the DB pool, connecting on demand: %s", exc)
 
 
 def get_session() -> Generator[Session, None, None]:
-    with Session(engine) as session:
+    with SessionLocal() as session:
         yield session
 
 
+# how information_schema.columns reports the timezone('utc', clock_timestamp()) default
+_PG_UTC_NOW_DEFAULT = "timezone('utc'::text, clock_timestamp())"
+
+
 def _run_schema_patches() -> None:
     """Lightweight, idempotent schema patches for new columns without Alembic."""
     with engine.begin() as conn:
+        # workers start together; let one run the patches while the others wait and find them done
+        conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('quiz_copilot_schema_patches'))"))
         conn.execute(
             text(
                 "ALTER TABLE question "
@@ -41,3 +103,118 @@ def _run_schema_patches() -> None:
                 "ADD COLUMN IF NOT EXISTS lowest_count_remaining INTEGER"
             )
         )
+        conn.execute(
+            text(
+                "ALTER TABLE question "
+                "ADD COLUMN IF NOT EXISTS content_hash VARCHAR(32) "
+                "GENERATED ALWAYS AS (md5(type || ':' || content)) STORED"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_question_bank_content_hash "
+                "ON question (bank_id, content_hash)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_question_bank_created_id "
+                "ON question (bank_id, created_at, id)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_favoritequestion_question_id "
+                "ON favoritequestion (question_id)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_wrong_user_qid_created "
+                "ON wrongrecord (user_id, question_id, created_at DESC)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_spanswer_session_question "
+                "ON smartpracticeanswer (session_id, question_id, answered_at)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_spitem_group_position "
+                "ON smartpracticeitem (group_id, position)"
+            )
+        )
+        # SET DEFAULT takes an ACCESS EXCLUSIVE lock, so only touch columns that still need it
+        current_defaults = dict(
+            conn.execute(
+                text(
+                    "SELECT table_name || '.' || column_name, column_default "
+                    "FROM information_schema.columns WHERE table_schema = current_schema()"
+                )
+            ).all()
+        )
+        for table in SQLModel.metadata.sorted_tables:
+            for column in table.c:
+                if not isinstance(column.type, DateTime) or column.server_default is None:
+                    continue
+                if current_defaults.get(f"{table.name}.{column.name}") == _PG_UTC_NOW_DEFAULT:
+                    continue
+                conn.execute(
+                    text(
+                        f'ALTER TABLE "{table.name}" '
+                        f"ALTER COLUMN {column.name} SET DEFAULT timezone('utc', clock_timestamp())"
+                    )
+                )
+        for column, fallback in (
+            (QuestionIssue.__table__.c.status, "pending"),
+            (SmartPracticeSession.__table__.c.status, "in_progress"),
+            (SmartPracticeGroup.__table__.c.mode, "normal"),
+        ):
+            _convert_to_enum(conn, column, fallback)
+
+
+def _convert_to_enum(conn: Connection, column: Column, fallback: str) -> None:
+    """Turn a VARCHAR column from older databases into the native enum declared on the model."""
+    table, name, enum_type = column.table.name, column.name, column.type
+    data_type = conn.execute(
+        text(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_name = :table AND column_name = :column"
+        ),
+        {"table": table, "column": name},
+    ).scalar()
+    if data_type is None or data_type == "USER-DEFINED":
+        return
+    # these used to be free-form strings; values the enum can't hold would make the cast fail
+    remapped = conn.execute(
+        text(f"UPDATE {table} SET {name} = :fallback WHERE NOT ({name} = ANY(:allowed))"),
+        {"fallback": fallback, "allowed": list(enum_type.enums)},
+    ).rowcount
+    if remapped:
+        logger.warning("Reset %d %s.%s values outside %s to %r", remapped, table, name, enum_type.enums, fallback)
+    enum_type.create(conn, checkfirst=True)
+    conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {name} TYPE {enum_type.name} USING {name}::{enum_type.name}"))
+
+
+def _create_search_indexes() -> None:
+    """Trigram indexes so admin keyword search (ILIKE '%kw%') avoids a full scan."""
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            conn.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_question_content_trgm "
+                    "ON question USING gin (content gin_trgm_ops)"
+                )
+            )
+            conn.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_question_standard_answer_trgm "
+                    "ON question USING gin (standard_answer gin_trgm_ops)"
+                )
+            )
+    except SQLAlchemyError as exc:
+        # search still works without them, just slower; don't block startup on missing pg_trgm
+        logger.warning("Skipping trigram search indexes: %s", exc)
@@ -1,16 +1,30 @@
 from __future__ import annotations
 
+import time
+from typing import Any
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
 from sqlmodel import Session, select
 
+from app.core.cache import response_cache
 from app.core.security import decode_token
 from app.db import get_session
-from app.models.db_models import User
+from app.models.db_models import Bank, User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+_USER_CACHE_TTL = 60.0
+_USER_CACHE_MAX = 10_000
+# username -> (generation, expiry, column values)
+_user_cache: dict[str, tuple[str, float, dict[str, Any]]] = {}
+
+_BANK_CACHE_TTL = 300.0
+_BANK_CACHE_MAX = 1024
+# bank id -> (generation, expiry, is_public)
+_bank_cache: dict[int, tuple[str, float, bool]] = {}
+
 
 def get_current_user(
     token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)
@@ -28,12 +42,69 @@ def get_current_user(
     except JWTError as exc:
         raise credentials_exception from exc
 
-    user = session.exec(select(User).where(User.username == username)).first()
+    user = _find_user(session, username)
     if user is None:
         raise credentials_exception
     return user
 
 
+def _find_user(session: Session, username: str) -> User | None:
+    """Username lookup behind a per-process cache, so most requests skip the query.
+
+    Entries are tagged with the ``user:{username}`` generation; :func:`forget_user` bumps
+    it, so every worker refetches on its next lookup. While Redis is unreachable the
+    cache is not trusted and the row is read every time.
+    """
+    generation = response_cache.generation(f"user:{username}")
+    now = time.monotonic()
+    cached = _user_cache.get(username)
+    if generation is not None and cached and cached[0] == generation and cached[1] > now:
+        return User(**cached[2])
+    user = session.exec(select(User).where(User.username == username)).first()
+    if user is None or generation is None:
+        _user_cache.pop(username, None)
+        return user
+    if len(_user_cache) >= _USER_CACHE_MAX:
+        _user_cache.clear()
+    # handlers only need identity and role; keep password hashes out of worker memory
+    _user_cache[username] = (generation, now + _USER_CACHE_TTL, user.model_dump(exclude={"hashed_password"}))
+    return user
+
+
+def forget_user(username: str) -> None:
+    """Call after changing a user's role or password, or deleting the account."""
+    _user_cache.pop(username, None)
+    response_cache.bump(f"user:{username}")
+
+
+def bank_visibility(session: Session, bank_id: int) -> bool | None:
+    """``is_public`` of the bank, or ``None`` if it does not exist.
+
+    Cached per process like :func:`_find_user`, under the ``bank:{id}`` generation that
+    :func:`forget_bank` (and any question write in the bank) bumps; without Redis the
+    flag is read every time.
+    """
+    generation = response_cache.generation(f"bank:{bank_id}")
+    now = time.monotonic()
+    cached = _bank_cache.get(bank_id)
+    if generation is not None and cached and cached[0] == generation and cached[1] > now:
+        return cached[2]
+    is_public = session.exec(select(Bank.is_public).where(Bank.id == bank_id)).first()
+    if is_public is None or generation is None:
+        _bank_cache.pop(bank_id, None)
+        return is_public
+    if len(_bank_cache) >= _BANK_CACHE_MAX:
+        _bank_cache.clear()
+    _bank_cache[bank_id] = (generation, now + _BANK_CACHE_TTL, is_public)
+    return is_public
+
+
+def forget_bank(bank_id: int) -> None:
+    """Call after a bank's visibility changes or it is deleted; reaches every worker."""
+    _bank_cache.pop(bank_id, None)
+    response_cache.bump(f"bank:{bank_id}")
+
+
 def require_admin(current_user: User = Depends(get_current_user)) -> User:
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Admin privileges required")
@@ -1,9 +1,19 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api import auth, banks, questions, smart_practice, study
 from app.core.config import settings
-from app.db import init_db
+from app.db import SessionLocal, init_db, warm_pool
+from app.services.ai_service import ai_service
+
+# Explicit lists keep CORSMiddleware off its wildcard path, which echoes the
+# request headers back on every preflight.
+CORS_ALLOW_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS")
+CORS_ALLOW_HEADERS = ("authorization", "content-type")
+
+# Load balancers poll /health constantly; serve one pre-encoded response.
+_HEALTH_RESPONSE = Response(content=b'{"status":"ok"}', media_type="application/json")
 
 
 def create_app() -> FastAPI:
@@ -12,14 +22,15 @@ def create_app() -> FastAPI:
         title=settings.app_name,
         version=settings.version,
         description="SmartQuiz API draft",
+        default_response_class=ORJSONResponse,
     )
 
     application.add_middleware(
         CORSMiddleware,
         allow_origins=settings.cors_origins,
         allow_credentials=False,
-        allow_methods=["*"],
-        allow_headers=["*"],
+        allow_methods=CORS_ALLOW_METHODS,
+        allow_headers=CORS_ALLOW_HEADERS,
     )
 
     application.include_router(auth.router, prefix="/api/v1/auth", tags=["Auth"])
@@ -30,13 +41,20 @@ def create_app() -> FastAPI:
     )
     application.include_router(study.router, prefix="/api/v1/study", tags=["Study"])
 
-    @application.get("/health", tags=["Health"])
-    async def health() -> dict[str, str]:
-        return {"status": "ok"}
+    @application.get("/health", tags=["Health"], responses={200: {"model": dict[str, str]}})
+    async def health() -> Response:
+        return _HEALTH_RESPONSE
 
     @application.on_event("startup")
     async def startup_event() -> None:
         init_db()
+        with SessionLocal() as session:
+            questions.fail_stale_jobs(session)
+        warm_pool()
+
+    @application.on_event("shutdown")
+    async def shutdown_event() -> None:
+        await ai_service.aclose()
 
     return application
 
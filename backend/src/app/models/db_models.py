@@ -3,16 +3,21 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import JSON, Column, UniqueConstraint, Enum
+from sqlalchemy import JSON, Column, Computed, DateTime, Index, String, UniqueConstraint, Enum, desc, func, text
 from sqlmodel import Field, SQLModel
 
+# 与 datetime.utcnow 一致：不带时区的 UTC 时间；用 clock_timestamp 保证同一事务内逐行递增
+_UTC_NOW = text("timezone('utc', clock_timestamp())")
+
 
 class User(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     username: str = Field(index=True, unique=True)
     hashed_password: str
     role: str = Field(default="user", sa_column=Column(Enum("user", "admin", name="user_role")))
-    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    created_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime, server_default=_UTC_NOW, nullable=False)
+    )
 
 
 class Bank(SQLModel, table=True):
@@ -21,7 +26,9 @@ class Bank(SQLModel, table=True):
     description: Optional[str] = None
     is_public: bool = False
     created_by: int | None = Field(default=None, foreign_key="user.id")
-    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    created_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime, server_default=_UTC_NOW, nullable=False)
+    )
 
 
 class Question(SQLModel, table=True):
@@ -33,7 +40,30 @@ class Question(SQLModel, table=True):
     standard_answer: str
     analysis: Optional[str] = None
     practice_count: int = Field(default=0, description="累计正确刷题计数")
-    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    created_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime, server_default=_UTC_NOW, nullable=False)
+    )
+    # 去重查找键，由数据库在每次写入时生成，勿手动赋值
+    content_hash: Optional[str] = Field(
+        default=None,
+        sa_column=Column(String(32), Computed("md5(type || ':' || content)", persisted=True)),
+    )
+
+    __table_args__ = (
+        Index("ix_question_bank_content_hash", "bank_id", "content_hash"),
+        # 题目列表按 (created_at, id) 倒序翻页，反向扫描即可命中
+        Index("ix_question_bank_created_id", "bank_id", "created_at", "id"),
+    )
+
+
+def db_utc_now():
+    """SQL expression for the current UTC time on the database clock, for timestamps set on update."""
+    return func.timezone("utc", func.clock_timestamp())
+
+
+def question_content_hash(type_: str, content: str):
+    """SQL expression equal to ``Question.content_hash`` for the given type/content."""
+    return func.md5(f"{type_}:{content}")
 
 
 class WrongRecord(SQLModel, table=True):
@@ -43,7 +73,15 @@ class WrongRecord(SQLModel, table=True):
     user_answer: str
     correct_answer: str
     is_correct: bool
-    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    # 由数据库写入时间（UTC），批量插入时无需逐行在 Python 里生成
+    created_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime, server_default=_UTC_NOW, nullable=False)
+    )
+
+    __table_args__ = (
+        # 错题统计按用户过滤、按 (question_id, created_at DESC) 分组取最新记录
+        Index("ix_wrong_user_qid_created", "user_id", "question_id", desc("created_at")),
+    )
 
 
 class QuestionIssue(SQLModel, table=True):
@@ -51,8 +89,15 @@ class QuestionIssue(SQLModel, table=True):
     question_id: int = Field(foreign_key="question.id", index=True)
     bank_id: int = Field(foreign_key="bank.id", index=True)
     reason: str = Field(default="")
-    status: str = Field(default="pending", description="pending | verified_ok | corrected")
-    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    status: str = Field(
+        default="pending",
+        sa_column=Column(
+            Enum("pending", "verified_ok", "corrected", name="question_issue_status"), nullable=False
+        ),
+    )
+    created_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime, server_default=_UTC_NOW, nullable=False)
+    )
 
 
 class FavoriteBank(SQLModel, table=True):
@@ -66,7 +111,8 @@ class FavoriteBank(SQLModel, table=True):
 class FavoriteQuestion(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id")
-    question_id: int = Field(foreign_key="question.id")
+    # 唯一约束 (user_id, question_id) 已覆盖按用户的查询；删除题目时按 question_id 清理收藏
+    question_id: int = Field(foreign_key="question.id", index=True)
 
     __table_args__ = (UniqueConstraint("user_id", "question_id", name="uq_user_question_fav"),)
 
@@ -78,7 +124,10 @@ class StudySession(SQLModel, table=True):
     mode: str
     score: int = 0
     answers: list[dict] = Field(default_factory=list, sa_column=Column(JSON))
-    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    # 由数据库写入时间（UTC），批量插入时无需逐行在 Python 里生成
+    created_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime, server_default=_UTC_NOW, nullable=False)
+    )
 
 
 class SmartPracticeSettings(SQLModel, table=True):
@@ -89,31 +138,51 @@ class SmartPracticeSettings(SQLModel, table=True):
     guaranteed_low_count: int = Field(default=20, description="每批保底抽取的低计数题数量")
     type_ratio: dict = Field(default_factory=dict, sa_column=Column(JSON))
     realtime_analysis: bool = Field(default=False)
-    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
-    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    updated_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime, server_default=_UTC_NOW, nullable=False)
+    )
+    created_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime, server_default=_UTC_NOW, nullable=False)
+    )
 
 
 class SmartPracticeSession(SQLModel, table=True):
     id: str = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id", index=True)
     settings_snapshot: dict = Field(default_factory=dict, sa_column=Column(JSON))
-    status: str = Field(default="in_progress", description="pending | in_progress | reinforce | completed")
+    status: str = Field(
+        default="in_progress",
+        sa_column=Column(
+            Enum("pending", "in_progress", "reinforce", "completed", name="smart_practice_status"),
+            nullable=False,
+        ),
+    )
     current_group_index: int = Field(default=0)
     current_question_index: int = Field(default=0, description="当前题组内的题目索引")
     round: int = Field(default=1, description="当前刷题轮次，从1开始")
     realtime_analysis: bool = Field(default=False)
     lowest_count_remaining: int | None = Field(default=None, description="当前轮次最低计数的题目数量")
-    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
-    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    created_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime, server_default=_UTC_NOW, nullable=False)
+    )
+    # 改动会话时赋值 db_utc_now()，与其它时间戳同用数据库时钟
+    updated_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime, server_default=_UTC_NOW, nullable=False)
+    )
 
 
 class SmartPracticeGroup(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     session_id: str = Field(foreign_key="smartpracticesession.id", index=True)
     group_index: int = Field(default=0)
-    mode: str = Field(default="normal", description="normal | reinforce")
+    mode: str = Field(
+        default="normal",
+        sa_column=Column(Enum("normal", "reinforce", name="smart_practice_group_mode"), nullable=False),
+    )
     total_questions: int = Field(default=0)
-    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    created_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime, server_default=_UTC_NOW, nullable=False)
+    )
 
 
 class SmartPracticeItem(SQLModel, table=True):
@@ -124,6 +193,9 @@ class SmartPracticeItem(SQLModel, table=True):
     position: int = Field(default=0)
     is_reinforce: bool = Field(default=False)
 
+    # 题组内的题目总是按 position 顺序读取
+    __table_args__ = (Index("ix_spitem_group_position", "group_id", "position"),)
+
 
 class SmartPracticeAnswer(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -132,7 +204,12 @@ class SmartPracticeAnswer(SQLModel, table=True):
     user_answer: str
     is_correct: bool
     counted: bool = Field(default=False, description="是否已计入 practice_count")
-    answered_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    answered_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime, server_default=_UTC_NOW, nullable=False)
+    )
+
+    # 按会话 + 题目查作答记录，并按作答时间筛选/排序
+    __table_args__ = (Index("ix_spanswer_session_question", "session_id", "question_id", "answered_at"),)
 
 
 class SmartPracticeFeedback(SQLModel, table=True):
@@ -141,4 +218,24 @@ class SmartPracticeFeedback(SQLModel, table=True):
     user_id: int = Field(foreign_key="user.id", index=True)
     question_id: int = Field(foreign_key="question.id", index=True)
     reason: str = Field(default="", description="用户反馈的题目问题")
-    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    created_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime, server_default=_UTC_NOW, nullable=False)
+    )
+
+
+class ImportJob(SQLModel, table=True):
+    id: str = Field(primary_key=True)
+    kind: str = Field(description="image_to_quiz | batch_import")
+    # 不设外键：删除题库后仍可查询历史任务
+    bank_id: int = Field(index=True)
+    user_id: int = Field(foreign_key="user.id", index=True)
+    status: str = Field(default="pending", description="pending | running | succeeded | failed")
+    result: Optional[dict | list] = Field(default=None, sa_column=Column(JSON))
+    error: Optional[str] = None
+    created_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime, server_default=_UTC_NOW, nullable=False)
+    )
+    # 每次 UPDATE 由数据库刷新
+    updated_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime, server_default=_UTC_NOW, onupdate=_UTC_NOW, nullable=False)
+    )
@@ -1,14 +1,21 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, List, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, model_validator
 
 
 class Option(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     key: str = Field(..., description="选项标识，如 A/B/C")
     text: str = Field(..., description="选项内容")
 
 
+def stored_options(raw: Optional[List[dict]]) -> List[Option]:
+    """Rebuild options read from a Question row; they were validated when written."""
+    return [Option.model_construct(**opt) for opt in raw or []]
+
+
 class Bank(BaseModel):
     id: int
     title: str
@@ -58,6 +65,14 @@ class Question(QuestionBase):
 class QuestionCreate(QuestionBase):
     """Payload when creating a question manually or via AI."""
 
+    @model_validator(mode="before")
+    @classmethod
+    def _bank_id_from_context(cls, data: Any, info: ValidationInfo) -> Any:
+        # AI output carries no bank_id; the caller supplies it as validation context
+        if info.context and "bank_id" in info.context and isinstance(data, dict):
+            data = {**data, "bank_id": info.context["bank_id"]}
+        return data
+
 
 class QuestionUpdate(BaseModel):
     bank_id: Optional[int] = None
@@ -77,6 +92,7 @@ class PaginatedQuestions(BaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
 
 
 class AIQuizRequest(BaseModel):
@@ -93,6 +109,7 @@ class BatchImportRequest(BaseModel):
     bank_id: int
     directory: str
     recursive: bool = True
+    concurrency: int = Field(default=4, ge=1, le=16, description="同时识别的文件数")
 
 
 class BatchImportFileResult(BaseModel):
@@ -112,7 +129,21 @@ class BatchImportResponse(BaseModel):
     file_results: List[BatchImportFileResult]
 
 
+class ImportJobStatus(BaseModel):
+    job_id: str
+    kind: str
+    status: str = Field(..., description="pending | running | succeeded | failed")
+    result: Optional[Any] = Field(
+        None, description="成功后的结果：image_to_quiz 为题目列表，batch_import 为 BatchImportResponse"
+    )
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+
 class StudyQuestion(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: int
     content: str
     type: str
@@ -169,7 +200,7 @@ class QuestionIssue(BaseModel):
 
 
 class QuestionIssueUpdate(BaseModel):
-    status: str
+    status: Literal["pending", "verified_ok", "corrected"]
     reason: Optional[str] = None
 
 
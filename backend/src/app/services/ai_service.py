@@ -1,16 +1,48 @@
 from __future__ import annotations
 
+import asyncio
 import base64
-import json
+import hashlib
 from typing import Any
 
 import httpx
+import orjson
 from pydantic import TypeAdapter, ValidationError
 
 from app.core.config import settings
 from app.models.schemas import QuestionCreate
 
 _QUESTION_LIST_ADAPTER = TypeAdapter(list[QuestionCreate])
+# line breaks from wrapped base64 (and stray blanks) dropped in a single pass
+_BASE64_WHITESPACE = str.maketrans("", "", "\r\n \t")
+_IMAGE_SIGNATURES = ((b"\xff\xd8", "image/jpeg"), (b"\x89PNG", "image/png"), (b"GIF8", "image/gif"))
+
+_IMAGE_PROMPT = (
+    "你是教育领域的出题助手。优先精准抽取图片中已有的试题并原样录入；"
+    "只有在图片内容不是题目时，才根据材料创作 2-4 道题。"
+    "输出必须是纯 JSON 数组，每个元素为题目对象，禁止返回任何额外文字或 Markdown 代码块。"
+    "字段要求："
+    '1) type: "choice_single"、"choice_multi"、"choice_judgment" 或 "short_answer"；'
+    "   判断题使用 type=choice_judgment，选项仅 A=正确、B=错误；"
+    "2) content: 题干文本；"
+    "3) options: choice_single/choice_multi/judgment 需提供 2-5 个选项数组，每项含 key(如 A/B/C/D) 与 text；"
+    "   short_answer 的 options 必须为空数组；"
+    "4) standard_answer: 单选/判断填正确选项字母；多选填多个正确选项字母，逗号或空格分隔；"
+    "   简答题填写参考答案文本；"
+    "5) analysis: 简要解析文本，可为空字符串。"
+    "示例输出："
+    '['
+    '{"type":"choice_judgment","content":"判断题干","options":[{"key":"A","text":"正确"},{"key":"B","text":"错误"}],"standard_answer":"A","analysis":"解析"},'
+    '{"type":"choice_multi","content":"多选题干","options":[{"key":"A","text":"选项1"},{"key":"B","text":"选项2"}],"standard_answer":"A,B","analysis":""},'
+    '{"type":"short_answer","content":"题干3","options":[],"standard_answer":"参考答案","analysis":""}'
+    ']'
+    "务必符合字段与类型，仅返回 JSON 数组。"
+)
+_GENERATION_CONFIG = {
+    "temperature": 0.2,
+    "maxOutputTokens": 1536,
+    "response_mime_type": "application/json",
+}
 
 
 class AIServiceError(Exception):
@@ -23,77 +55,83 @@ class AIService:
         self.api_base = api_base.rstrip("/")
         self.model = model
         self.timeout = timeout
+        # the key travels in a header so it never shows up in URLs logged by proxies or httpx hooks
+        self._url = f"{self.api_base}/v1beta/models/{model}:generateContent"
+        self._headers = {"x-goog-api-key": api_key or "", "Content-Type": "application/json"}
+        # Gemini calls currently running, keyed by request-body digest
+        self._inflight: dict[bytes, asyncio.Task[str]] = {}
+        # one keep-alive pool for every call, created on first use; see aclose()
+        self._client: httpx.AsyncClient | None = None
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def generate_questions_from_image(self, image_base64: str, bank_id: int) -> list[QuestionCreate]:
         if not image_base64:
             raise AIServiceError("缺少待识别的图片内容")
 
-        sanitized = self._sanitize_base64(image_base64)
-        payload = self._build_image_prompt(sanitized)
-        text = await self._invoke_gemini(payload)
+        # Images arrive as multi-megabyte base64 strings; cleaning and encoding
+        # them is blocking work, so it runs in a worker thread.
+        body, digest = await asyncio.to_thread(self._encode_image_request, image_base64)
+        text = await self._invoke_gemini_shared(body, digest)
         return self._parse_questions(text, bank_id)
 
+    def _encode_image_request(self, image_base64: str) -> tuple[bytes, bytes]:
+        sanitized = self._sanitize_base64(image_base64)
+        body = orjson.dumps(self._build_image_prompt(sanitized))
+        return body, hashlib.sha256(body).digest()
+
+    async def _invoke_gemini_shared(self, body: bytes, digest: bytes) -> str:
+        """Let concurrent requests for the same image wait on a single Gemini call."""
+        task = self._inflight.get(digest)
+        if task is None:
+            task = asyncio.ensure_future(self._invoke_gemini(body))
+            self._inflight[digest] = task
+            task.add_done_callback(lambda _: self._inflight.pop(digest, None))
+        # shield: one caller disconnecting must not cancel the call the others are waiting on
+        return await asyncio.shield(task)
+
     def _sanitize_base64(self, data: str) -> str:
         cleaned = data.strip()
         if "," in cleaned and cleaned.lower().startswith("data:"):
             cleaned = cleaned.split(",", 1)[1]
-        return cleaned.replace("\n", "").replace("\r", "")
+        return cleaned.translate(_BASE64_WHITESPACE)
 
     def _build_image_prompt(self, image_base64: str) -> dict[str, Any]:
         mime_type = self._infer_mime_type(image_base64)
-        prompt = (
-            "你是教育领域的出题助手。优先精准抽取图片中已有的试题并原样录入；"
-            "只有在图片内容不是题目时，才根据材料创作 2-4 道题。"
-            "输出必须是纯 JSON 数组，每个元素为题目对象，禁止返回任何额外文字或 Markdown 代码块。"
-            "字段要求："
-            '1) type: "choice_single"、"choice_multi"、"choice_judgment" 或 "short_answer"；'
-            "   判断题使用 type=choice_judgment，选项仅 A=正确、B=错误；"
-            "2) content: 题干文本；"
-            "3) options: choice_single/choice_multi/judgment 需提供 2-5 个选项数组，每项含 key(如 A/B/C/D) 与 text；"
-            "   short_answer 的 options 必须为空数组；"
-            "4) standard_answer: 单选/判断填正确选项字母；多选填多个正确选项字母，逗号或空格分隔；"
-            "   简答题填写参考答案文本；"
-            "5) analysis: 简要解析文本，可为空字符串。"
-            "示例输出："
-            '['
-            '{"type":"choice_judgment","content":"判断题干","options":[{"key":"A","text":"正确"},{"key":"B","text":"错误"}],"standard_answer":"A","analysis":"解析"},'
-            '{"type":"choice_multi","content":"多选题干","options":[{"key":"A","text":"选项1"},{"key":"B","text":"选项2"}],"standard_answer":"A,B","analysis":""},'
-            '{"type":"short_answer","content":"题干3","options":[],"standard_answer":"参考答案","analysis":""}'
-            ']'
-            "务必符合字段与类型，仅返回 JSON 数组。"
-        )
         return {
             "contents": [
                 {
                     "parts": [
-                        {"text": prompt},
+                        {"text": _IMAGE_PROMPT},
                         {"inline_data": {"mime_type": mime_type, "data": image_base64}},
                     ]
                 }
             ],
-            "generationConfig": {
-                "temperature": 0.2,
-                "maxOutputTokens": 1536,
-                "response_mime_type": "application/json",
-            },
+            "generationConfig": _GENERATION_CONFIG,
         }
 
-    async def _invoke_gemini(self, payload: dict[str, Any]) -> str:
+    async def _invoke_gemini(self, body: bytes) -> str:
         if not self.api_key:
             raise AIServiceError("Gemini API key 未配置")
 
-        url = f"{self.api_base}/v1beta/models/{self.model}:generateContent?key={self.api_key}"
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            )
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(url, json=payload)
-                response.raise_for_status()
+            response = await self._client.post(self._url, content=body, headers=self._headers)
+            response.raise_for_status()
         except httpx.HTTPStatusError as exc:
             detail = exc.response.text
             raise AIServiceError(f"Gemini 调用失败: {exc.response.status_code} {detail}") from exc
         except httpx.HTTPError as exc:
             raise AIServiceError(f"Gemini 请求异常: {exc}") from exc
 
-        data: dict[str, Any] = response.json()
+        data: dict[str, Any] = orjson.loads(response.content)
         return self._extract_text(data)
 
     def _extract_text(self, data: dict[str, Any]) -> str:
@@ -108,20 +146,23 @@ class AIService:
         raise AIServiceError("Gemini 返回为空，未能识别图片内容")
 
     def _parse_questions(self, text: str, bank_id: int) -> list[QuestionCreate]:
-        cleaned_text = self._strip_code_fence(text)
+        body = self._extract_json_array(text)
+        if body is None:
+            raise AIServiceError("Gemini 返回的内容不是有效的 JSON")
         try:
-            payload = json.loads(cleaned_text)
-        except json.JSONDecodeError as exc:
-            fallback = self._extract_json_array(cleaned_text)
-            if fallback is None:
+            # well-formed output validates straight from JSON in one pass
+            questions = _QUESTION_LIST_ADAPTER.validate_json(body, context={"bank_id": bank_id})
+        except ValidationError as exc:
+            if exc.errors()[0]["type"] == "json_invalid":
                 raise AIServiceError("Gemini 返回的内容不是有效的 JSON") from exc
-            payload = fallback
-
-        if not isinstance(payload, list):
-            raise AIServiceError("Gemini 返回格式应为题目数组")
+        else:
+            if questions:
+                return questions
+            raise AIServiceError("Gemini 未生成可用题目")
 
+        # valid JSON with loose items (null options, stray non-objects): normalize, then validate
         normalized: list[dict[str, Any]] = []
-        for item in payload:
+        for item in orjson.loads(body):
             if not isinstance(item, dict):
                 continue
             options = item.get("options") or []
@@ -137,41 +178,23 @@ class AIService:
         except ValidationError as exc:
             raise AIServiceError("Gemini 生成的题目字段缺失或格式不符") from exc
 
-    def _strip_code_fence(self, text: str) -> str:
-        stripped = text.strip()
-        if stripped.startswith("```"):
-            stripped = stripped.lstrip("`")
-            if "\n" in stripped:
-                stripped = stripped.split("\n", 1)[1]
-        if stripped.endswith("```"):
-            stripped = stripped[: stripped.rfind("```")].strip()
-        return stripped
-
-    def _extract_json_array(self, text: str) -> list[Any] | None:
+    def _extract_json_array(self, text: str) -> str | None:
+        # outermost [...] only: skips code fences and any prose Gemini wraps around the array
         start = text.find("[")
         end = text.rfind("]")
-        if start == -1 or end == -1 or end <= start:
-            return None
-        try:
-            return json.loads(text[start : end + 1])
-        except json.JSONDecodeError:
+        if start == -1 or end <= start:
             return None
+        return text[start : end + 1]
 
     def _infer_mime_type(self, image_base64: str) -> str:
-        sample = image_base64[:128]
-        remainder = len(sample) % 4
-        if remainder:
-            sample += "=" * (4 - remainder)
+        # the magic numbers fit in the first 6 bytes, i.e. 8 base64 characters
         try:
-            header = base64.b64decode(sample, validate=False)
-        except Exception:
-            return "image/png"
-        if header.startswith(b"\xff\xd8"):
-            return "image/jpeg"
-        if header.startswith(b"\x89PNG"):
+            header = base64.b64decode(image_base64[:8], validate=False)
+        except ValueError:
             return "image/png"
-        if header.startswith(b"GIF8"):
-            return "image/gif"
+        for signature, mime_type in _IMAGE_SIGNATURES:
+            if header.startswith(signature):
+                return mime_type
         return "image/png"
 
 
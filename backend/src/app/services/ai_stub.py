@@ -1,31 +1,50 @@
 """Lightweight AI stub that fabricates quiz questions for demos."""
 
-from textwrap import shorten
-
 from app.models.schemas import Option, QuestionCreate
 
+# Only bank_id and the snippet vary between calls, so the option sets and
+# fixed texts are built once. Options are shared read-only; each question
+# still gets its own list.
+_CHOICE_OPTIONS: tuple[Option, ...] = tuple(
+    Option.model_construct(key=key, text=text)
+    for key, text in (
+        ("A", "概括核心观点"),
+        ("B", "与材料无关的陈述"),
+        ("C", "材料的细节例子"),
+        ("D", "相反立场"),
+    )
+)
+_JUDGMENT_OPTIONS: tuple[Option, ...] = (
+    Option.model_construct(key="A", text="正确"),
+    Option.model_construct(key="B", text="错误"),
+)
+_IMAGE_OPTIONS: tuple[Option, ...] = tuple(
+    Option.model_construct(key=key, text=text)
+    for key, text in (("A", "选择题示例"), ("B", "解答题示例"), ("C", "与试卷无关"))
+)
+
+
+_SNIPPET_WIDTH = 80
+
 
 def _safe_snippet(text: str) -> str:
-    return shorten(text.strip().replace("\n", " "), width=80, placeholder="...")
+    # Only the head of the material is shown, so normalise a bounded slice
+    # instead of the whole upload.
+    return " ".join(text[: _SNIPPET_WIDTH * 4].split())[:_SNIPPET_WIDTH]
 
 
 def generate_questions_from_text(text: str, bank_id: int) -> list[QuestionCreate]:
     snippet = _safe_snippet(text) or "这是一段待识别的学习资料"
-    choice_question = QuestionCreate(
+    choice_question = QuestionCreate.model_construct(
         bank_id=bank_id,
         type="choice_single",
         content=f"基于材料，下列描述最贴近原文含义？\n{snippet}",
-        options=[
-            Option(key="A", text="概括核心观点"),
-            Option(key="B", text="与材料无关的陈述"),
-            Option(key="C", text="材料的细节例子"),
-            Option(key="D", text="相反立场"),
-        ],
+        options=list(_CHOICE_OPTIONS),
         standard_answer="A",
         analysis="聚焦材料中的核心主张或结论。",
     )
 
-    short_answer = QuestionCreate(
+    short_answer = QuestionCreate.model_construct(
         bank_id=bank_id,
         type="short_answer",
         content="用一句话总结材料的要点？",
@@ -33,11 +52,11 @@ def generate_questions_from_text(text: str, bank_id: int) -> list[QuestionCreate
         standard_answer="突出关键词与结论即可。",
         analysis="回答需包含材料中提到的关键要素与结论。",
     )
-    judgment = QuestionCreate(
+    judgment = QuestionCreate.model_construct(
         bank_id=bank_id,
         type="choice_judgment",
         content="判断：材料的核心论断与选项 A 一致。",
-        options=[Option(key="A", text="正确"), Option(key="B", text="错误")],
+        options=list(_JUDGMENT_OPTIONS),
         standard_answer="A",
         analysis="示例判断题，用于演示独立的判断题类型。",
     )
@@ -47,15 +66,11 @@ def generate_questions_from_text(text: str, bank_id: int) -> list[QuestionCreate
 def generate_questions_from_image(image_base64: str, bank_id: int) -> list[QuestionCreate]:
     marker = image_base64[:16] if image_base64 else "image"
     return [
-        QuestionCreate(
+        QuestionCreate.model_construct(
             bank_id=bank_id,
             type="choice_single",
             content=f"图片({marker}...)识别：最可能的考点是什么？",
-            options=[
-                Option(key="A", text="选择题示例"),
-                Option(key="B", text="解答题示例"),
-                Option(key="C", text="与试卷无关"),
-            ],
+            options=list(_IMAGE_OPTIONS),
             standard_answer="A",
             analysis="示例数据，后续接入真实 OCR 与解析。",
         )
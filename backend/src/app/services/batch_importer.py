@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 import base64
 import logging
+import mmap
 import os
+from collections import defaultdict
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterable, List, NamedTuple
 
+from sqlalchemy import insert
 from sqlmodel import Session, select
 
 from app.core.config import settings
@@ -17,7 +21,7 @@ from app.models.schemas import (
 )
 from app.services.ai_service import AIService, AIServiceError
 from app.services.ai_stub import generate_questions_from_text
-from app.models.db_models import Question as QuestionDB
+from app.models.db_models import Question as QuestionDB, question_content_hash
 
 
 SUPPORTED_IMAGE_EXT = {".png", ".jpg", ".jpeg", ".gif", ".bmp"}
@@ -32,7 +36,8 @@ def _configure_logger() -> logging.Logger:
     logger.setLevel(level)
     logs_dir = Path(__file__).resolve().parents[3] / "logs"
     logs_dir.mkdir(parents=True, exist_ok=True)
-    handler = logging.FileHandler(logs_dir / "batch_import.log", encoding="utf-8")
+    # delay: the file is only created once something is logged, not on import
+    handler = logging.FileHandler(logs_dir / "batch_import.log", encoding="utf-8", delay=True)
     handler.setLevel(level)
     formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
     handler.setFormatter(formatter)
@@ -43,6 +48,22 @@ def _configure_logger() -> logging.Logger:
 logger = _configure_logger()
 
 
+class _NormalizedQuestion(NamedTuple):
+    """Comparison forms of a question, computed once instead of per candidate."""
+
+    answer: str  # stripped, lower-cased standard answer
+    options: tuple[tuple[str, str], ...]  # (key, stripped text) in order
+    answer_keys: frozenset[str]  # comma-separated answer letters
+
+
+def _normalize(standard_answer: str, options: Iterable[tuple[str, str]]) -> _NormalizedQuestion:
+    return _NormalizedQuestion(
+        answer=standard_answer.strip().lower(),
+        options=tuple((key, text.strip()) for key, text in options),
+        answer_keys=frozenset(a.strip() for a in standard_answer.split(",") if a.strip()),
+    )
+
+
 class BatchImportService:
     def __init__(self, session: Session, ai: AIService) -> None:
         self.session = session
@@ -60,12 +81,16 @@ class BatchImportService:
         duplicate_total = 0
         failed_files = 0
 
-        for file_path in files:
+        # files are independent: recognise them concurrently, then store them one by one in order
+        semaphore = asyncio.Semaphore(request.concurrency)
+        processed = await asyncio.gather(
+            *(self._process_file_guarded(file_path, request.bank_id, semaphore) for file_path in files)
+        )
+
+        for file_path, questions in zip(files, processed):
             result = BatchImportFileResult(filename=str(file_path))
-            try:
-                questions = await self._process_file(file_path, request.bank_id)
-            except Exception as exc:  # noqa: BLE001
-                result.errors.append(str(exc))
+            if isinstance(questions, Exception):
+                result.errors.append(str(questions))
                 failed_files += 1
                 file_results.append(result)
                 continue
@@ -77,28 +102,10 @@ class BatchImportService:
                 logger.error("Import failed (no questions): %s", file_path)
                 continue
 
-            for q in questions:
-                warnings = self._validate_question(q)
-                if warnings:
-                    result.warnings.extend(warnings)
-                existing = self._find_duplicate(q)
-                if existing:
-                    result.duplicates += 1
-                    duplicate_total += 1
-                else:
-                    created = QuestionDB(
-                        bank_id=q.bank_id,
-                        type=q.type,
-                        content=q.content,
-                        options=[opt.model_dump() for opt in q.options],
-                        standard_answer=q.standard_answer,
-                        analysis=q.analysis,
-                    )
-                    self.session.add(created)
-                    self.session.commit()
-                    self.session.refresh(created)
-                    result.imported += 1
-                    imported_total += 1
+            # DB work is synchronous; keep it off the event loop between AI calls
+            await asyncio.to_thread(self._store_questions, questions, result)
+            imported_total += result.imported
+            duplicate_total += result.duplicates
 
             file_results.append(result)
             if result.errors:
@@ -121,50 +128,104 @@ class BatchImportService:
             file_results=file_results,
         )
 
+    def store_questions(
+        self, questions: List[QuestionCreate], bank_id: int, source: str = ""
+    ) -> BatchImportFileResult:
+        """Validate, dedupe and insert already-parsed questions into ``bank_id`` in one commit.
+
+        For callers that parse questions themselves (e.g. the question-bank import script);
+        ``source`` only labels the returned result.
+        """
+        result = BatchImportFileResult(filename=source)
+        questions = [
+            q if q.bank_id == bank_id else q.model_copy(update={"bank_id": bank_id}) for q in questions
+        ]
+        self._store_questions(questions, result)
+        return result
+
+    def _store_questions(self, questions: List[QuestionCreate], result: BatchImportFileResult) -> None:
+        candidates = self._load_candidates(questions)
+        rows: List[dict] = []
+        for q in questions:
+            normalized = _normalize(q.standard_answer, ((opt.key, opt.text) for opt in q.options))
+            warnings = self._validate_question(q, normalized)
+            if warnings:
+                result.warnings.extend(warnings)
+            existing = candidates[(q.bank_id, q.type, q.content)]
+            if any(self._is_duplicate(c, normalized, q.type) for c in existing):
+                result.duplicates += 1
+            else:
+                row = {
+                    "bank_id": q.bank_id,
+                    "type": q.type,
+                    "content": q.content,
+                    # Option is just key/text, already validated; no need for model_dump per option
+                    "options": [{"key": opt.key, "text": opt.text} for opt in q.options],
+                    "standard_answer": q.standard_answer,
+                    "analysis": q.analysis,
+                }
+                rows.append(row)
+                # later questions in the same file must dedupe against this one too
+                existing.append(normalized)
+        if rows:
+            self.session.execute(insert(QuestionDB), rows)
+            self.session.commit()
+            result.imported += len(rows)
+
+    async def _process_file_guarded(
+        self, path: Path, bank_id: int, semaphore: asyncio.Semaphore
+    ) -> List[QuestionCreate] | Exception:
+        async with semaphore:
+            try:
+                return await self._process_file(path, bank_id)
+            except Exception as exc:  # noqa: BLE001
+                return exc
+
     async def _process_file(self, path: Path, bank_id: int) -> List[QuestionCreate]:
         suffix = path.suffix.lower()
+        # disk reads and the text parser block, so they run in worker threads
         if suffix in SUPPORTED_IMAGE_EXT:
-            image_base64 = self._read_image_base64(path)
+            image_base64 = await asyncio.to_thread(self._read_image_base64, path)
             try:
                 return await self.ai.generate_questions_from_image(image_base64, bank_id)
             except AIServiceError as exc:
                 raise RuntimeError(f"图片识别失败: {exc}")
         if suffix in SUPPORTED_TEXT_EXT:
-            text = path.read_text(encoding="utf-8", errors="ignore")
-            return generate_questions_from_text(text, bank_id)
+            text = await asyncio.to_thread(path.read_text, encoding="utf-8", errors="ignore")
+            return await asyncio.to_thread(generate_questions_from_text, text, bank_id)
         raise RuntimeError("不支持的文件类型")
 
-    def _iter_files(self, directory: Path, recursive: bool) -> Iterable[Path]:
-        if recursive:
-            for root, _, filenames in os.walk(directory):
-                for name in filenames:
-                    yield Path(root) / name
-        else:
-            for entry in directory.iterdir():
+    def _iter_files(self, directory: Path | str, recursive: bool) -> Iterable[Path]:
+        # DirEntry carries the file type from the directory read, so no extra stat per entry
+        with os.scandir(directory) as entries:
+            for entry in entries:
                 if entry.is_file():
-                    yield entry
+                    yield Path(entry.path)
+                elif recursive and entry.is_dir(follow_symlinks=False):
+                    yield from self._iter_files(entry.path, recursive)
 
     def _read_image_base64(self, path: Path) -> str:
-        data = path.read_bytes()
-        return base64.b64encode(data).decode("utf-8")
+        with path.open("rb") as fh:
+            if os.fstat(fh.fileno()).st_size == 0:
+                return ""
+            # encode straight from the mapped file rather than a bytes copy of it;
+            # base64 output is pure ASCII, which str builds from directly
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return base64.b64encode(mapped).decode("ascii")
 
-    def _validate_question(self, question: QuestionCreate) -> List[str]:
+    def _validate_question(self, question: QuestionCreate, normalized: _NormalizedQuestion) -> List[str]:
         warnings: List[str] = []
         content = question.content.strip()
         if len(content) < 6 or content.endswith("..."):
             warnings.append("题干可能被截断，请人工核对")
 
         if question.type in {"choice_single", "choice_multi"}:
-            option_keys = [opt.key for opt in question.options]
             if len(question.options) < 2:
                 warnings.append("选项少于2个，可能识别不完整")
-            answers = [a.strip() for a in question.standard_answer.split(",") if a.strip()]
-            if not answers:
+            if not normalized.answer_keys:
                 warnings.append("未识别到标准答案")
-            else:
-                missing = [ans for ans in answers if ans not in option_keys]
-                if missing:
-                    warnings.append("标准答案不在选项中，可能识别不清")
+            elif normalized.answer_keys - {key for key, _ in normalized.options}:
+                warnings.append("标准答案不在选项中，可能识别不清")
         else:
             if len(question.standard_answer.strip()) < 1:
                 warnings.append("简答题答案缺失或过短")
@@ -172,29 +233,33 @@ class BatchImportService:
         return warnings
 
 
-    def _find_duplicate(self, payload: QuestionCreate) -> QuestionDB | None:
-        candidate = (
-            self.session.exec(
-                select(QuestionDB).where(
-                    QuestionDB.bank_id == payload.bank_id,
-                    QuestionDB.type == payload.type,
-                    QuestionDB.content == payload.content,
-                )
-            ).first()
-        )
-        if not candidate:
-            return None
-        if payload.type in {"choice_single", "choice_multi"}:
-            if candidate.standard_answer.strip().lower() != payload.standard_answer.strip().lower():
-                return None
-            if len(candidate.options or []) != len(payload.options or []):
-                return None
-            opts_match = all(
-                co.get("key") == po.key and (co.get("text") or "").strip() == po.text.strip()
-                for co, po in zip(candidate.options or [], payload.options or [])
+    def _load_candidates(
+        self, questions: List[QuestionCreate]
+    ) -> dict[tuple[int, str, str], List[_NormalizedQuestion]]:
+        """Fetch every stored question that could duplicate one in this file, in one query."""
+        bank_ids = {q.bank_id for q in questions}
+        pairs = {(q.type, q.content) for q in questions}
+        rows = self.session.exec(
+            select(
+                QuestionDB.bank_id,
+                QuestionDB.type,
+                QuestionDB.content,
+                QuestionDB.standard_answer,
+                QuestionDB.options,
+            ).where(
+                QuestionDB.bank_id.in_(bank_ids),
+                QuestionDB.content_hash.in_([question_content_hash(t, c) for t, c in pairs]),
             )
-            return candidate if opts_match else None
-        if payload.type == "short_answer":
-            if candidate.standard_answer.strip().lower() == payload.standard_answer.strip().lower():
-                return candidate
-        return None
+        ).all()
+        candidates: dict[tuple[int, str, str], List[_NormalizedQuestion]] = defaultdict(list)
+        for row in rows:
+            options = ((opt.get("key"), opt.get("text") or "") for opt in row.options or [])
+            candidates[(row.bank_id, row.type, row.content)].append(_normalize(row.standard_answer, options))
+        return candidates
+
+    def _is_duplicate(self, candidate: _NormalizedQuestion, payload: _NormalizedQuestion, qtype: str) -> bool:
+        if qtype in {"choice_single", "choice_multi"}:
+            return candidate.answer == payload.answer and candidate.options == payload.options
+        if qtype == "short_answer":
+            return candidate.answer == payload.answer
+        return False
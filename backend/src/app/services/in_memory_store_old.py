@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import random
+import threading
 from datetime import datetime
 from typing import Dict, List
 
@@ -21,9 +22,15 @@ class InMemoryStore:
     def __init__(self) -> None:
         self.banks: Dict[int, Bank] = {}
         self.questions: Dict[int, Question] = {}
+        # the same questions grouped by bank, each group in insertion order
+        self._by_bank: Dict[int, Dict[int, Question]] = {}
         self.wrong_records: List[WrongQuestionSummary] = []
+        # newest record per question, kept in step with wrong_records
+        self._latest_by_qid: Dict[int, WrongQuestionSummary] = {}
         self._bank_id = 1
         self._question_id = 1
+        # guards the id counters and the check-then-write sequences below
+        self._lock = threading.Lock()
         self._seed()
 
     def _seed(self) -> None:
@@ -53,68 +60,96 @@ class InMemoryStore:
         )
 
     def create_bank(self, payload: BankCreate) -> Bank:
-        bank = Bank(id=self._bank_id, **payload.model_dump())
-        self.banks[bank.id] = bank
-        self._bank_id += 1
+        with self._lock:
+            bank = Bank(id=self._bank_id, **payload.model_dump())
+            self.banks[bank.id] = bank
+            self._bank_id += 1
         return bank
 
-    def delete_bank(self, bank_id: int) -> None:
-        self.banks.pop(bank_id, None)
-        self.questions = {qid: q for qid, q in self.questions.items() if q.bank_id != bank_id}
-        self.wrong_records = [record for record in self.wrong_records if record.question.bank_id != bank_id]
+    def delete_bank(self, bank_id: int) -> bool:
+        """Remove a bank and its questions; return False if it did not exist."""
+        with self._lock:
+            if self.banks.pop(bank_id, None) is None:
+                return False
+            for qid in self._by_bank.pop(bank_id, {}):
+                del self.questions[qid]
+            self.wrong_records = [
+                record for record in self.wrong_records if record.question.bank_id != bank_id
+            ]
+            self._latest_by_qid = {
+                qid: record for qid, record in self._latest_by_qid.items() if record.question.bank_id != bank_id
+            }
+        return True
 
     def update_bank(self, bank_id: int, payload: BankUpdate) -> Bank:
-        bank = self.banks.get(bank_id)
-        if bank is None:
-            raise KeyError("bank not found")
-        update_data = payload.model_dump(exclude_none=True)
-        updated = Bank(id=bank.id, **{**bank.model_dump(), **update_data})
-        self.banks[bank_id] = updated
+        with self._lock:
+            bank = self.banks.get(bank_id)
+            if bank is None:
+                raise KeyError("bank not found")
+            update_data = payload.model_dump(exclude_none=True)
+            updated = Bank(id=bank.id, **{**bank.model_dump(), **update_data})
+            self.banks[bank_id] = updated
         return updated
 
     def list_banks(self) -> List[Bank]:
         return list(self.banks.values())
 
     def create_question(self, payload: QuestionCreate) -> Question:
-        existing = self._find_duplicate_question(payload)
-        if existing:
-            return existing
-        question = Question(id=self._question_id, **payload.model_dump())
-        self.questions[question.id] = question
-        self._question_id += 1
+        with self._lock:
+            existing = self._find_duplicate_question(payload)
+            if existing:
+                return existing
+            question = Question(id=self._question_id, **payload.model_dump())
+            self.questions[question.id] = question
+            self._by_bank.setdefault(question.bank_id, {})[question.id] = question
+            self._question_id += 1
         return question
 
     def update_question(self, question_id: int, payload: QuestionUpdate) -> Question:
-        question = self.questions.get(question_id)
-        if question is None:
-            raise KeyError("question not found")
-
-        update_data = payload.model_dump(exclude_none=True)
-        question_data = question.model_dump()
-        question_data.update(update_data)
-        updated = Question(**question_data)
-        self.questions[question_id] = updated
-
-        # also update any wrong records to keep content in sync
-        for idx, record in enumerate(self.wrong_records):
-            if record.question.id == question_id:
-                self.wrong_records[idx] = WrongQuestionSummary(
-                    question=updated,
-                    user_answer=record.user_answer,
-                    correct_answer=updated.standard_answer,
-                    created_at=record.created_at,
-                )
+        with self._lock:
+            question = self.questions.get(question_id)
+            if question is None:
+                raise KeyError("question not found")
+
+            update_data = payload.model_dump(exclude_none=True)
+            question_data = question.model_dump()
+            question_data.update(update_data)
+            updated = Question(**question_data)
+            self.questions[question_id] = updated
+            if updated.bank_id != question.bank_id:
+                del self._by_bank[question.bank_id][question_id]
+            self._by_bank.setdefault(updated.bank_id, {})[question_id] = updated
+
+            # also update any wrong records to keep content in sync
+            for idx, record in enumerate(self.wrong_records):
+                if record.question.id == question_id:
+                    self.wrong_records[idx] = WrongQuestionSummary(
+                        question=updated,
+                        user_answer=record.user_answer,
+                        correct_answer=updated.standard_answer,
+                        created_at=record.created_at,
+                    )
+                    # records are in answer order, so the last match is the newest
+                    self._latest_by_qid[question_id] = self.wrong_records[idx]
         return updated
 
     def list_questions(self, bank_id: int | None = None) -> List[Question]:
         if bank_id is None:
             return list(self.questions.values())
-        return [q for q in self.questions.values() if q.bank_id == bank_id]
-
-    def delete_question(self, question_id: int) -> None:
-        if question_id in self.questions:
-            del self.questions[question_id]
-        self.wrong_records = [record for record in self.wrong_records if record.question.id != question_id]
+        return list(self._by_bank.get(bank_id, {}).values())
+
+    def delete_question(self, question_id: int) -> bool:
+        """Remove a question; return False if it did not exist."""
+        with self._lock:
+            question = self.questions.pop(question_id, None)
+            if question is None:
+                return False
+            del self._by_bank[question.bank_id][question_id]
+            self.wrong_records = [
+                record for record in self.wrong_records if record.question.id != question_id
+            ]
+            self._latest_by_qid.pop(question_id, None)
+        return True
 
     def get_question(self, question_id: int) -> Question | None:
         return self.questions.get(question_id)
@@ -123,8 +158,8 @@ class InMemoryStore:
         normalized_content = payload.content.strip()
         normalized_answer = payload.standard_answer.strip().lower()
 
-        for question in self.questions.values():
-            if question.bank_id != payload.bank_id or question.type != payload.type:
+        for question in self._by_bank.get(payload.bank_id, {}).values():
+            if question.type != payload.type:
                 continue
             if question.content.strip() != normalized_content:
                 continue
@@ -149,10 +184,9 @@ class InMemoryStore:
         return None
 
     def get_wrong_question_ids(self) -> List[int]:
-        latest: Dict[int, WrongQuestionSummary] = {}
-        for record in self.wrong_records:
-            latest[record.question.id] = record
-        return [qid for qid, record in latest.items() if record.user_answer != record.correct_answer]
+        return [
+            qid for qid, record in self._latest_by_qid.items() if record.user_answer != record.correct_answer
+        ]
 
     def record_answer(
         self,
@@ -162,21 +196,18 @@ class InMemoryStore:
     ) -> WrongQuestionSummary | None:
         summary = WrongQuestionSummary(
             question=question,
-            user_answer=user_answer,
+            # keep a "correct" record to overwrite older wrong states
+            user_answer=question.standard_answer if is_correct else user_answer,
             correct_answer=question.standard_answer,
             created_at=datetime.utcnow(),
         )
-        self.wrong_records.append(summary)
-        if is_correct:
-            # keep a "correct" record to overwrite older wrong states
-            summary.user_answer = question.standard_answer
+        with self._lock:
+            self.wrong_records.append(summary)
+            self._latest_by_qid[question.id] = summary
         return None if is_correct else summary
 
     def list_wrong_records(self) -> List[WrongQuestionSummary]:
-        latest: Dict[int, WrongQuestionSummary] = {}
-        for record in self.wrong_records:
-            latest[record.question.id] = record
-        return list(latest.values())
+        return list(self._latest_by_qid.values())
 
     def pick_questions_for_session(self, bank_id: int, mode: str = "random") -> List[Question]:
         questions = self.list_questions(bank_id=bank_id)
@@ -4,12 +4,15 @@ import math
 import random
 import re
 from datetime import datetime
-from typing import Iterable
+from functools import lru_cache
+from typing import Iterable, NamedTuple
 from uuid import uuid4
 
 from fastapi import HTTPException
+from sqlalchemy import update
 from sqlmodel import Session, delete, select
 
+from app.core.cache import response_cache
 from app.models import schemas
 from app.models.db_models import (
     Bank,
@@ -21,6 +24,7 @@ from app.models.db_models import (
     SmartPracticeSession,
     SmartPracticeSettings,
     User,
+    db_utc_now,
 )
 
 # 开关：是否尊重用户所选题库，仅从中抽题 若为 False，则从所有可访问题库中抽题
@@ -51,10 +55,14 @@ def _derive_selected_types(type_ratio: dict | None) -> list[str]:
     return selected or ["choice_single", "choice_multi", "choice_judgment"]
 
 
+# 支持空格/中英文逗号/分号/斜杠/顿号/竖线等常见分隔，顺序不敏感
+_CHOICE_SEP_RE = re.compile(r"[,，\s;；、/|]+")
+
+
+@lru_cache(maxsize=1024)
 def _normalize_answer(val: str, qtype: str) -> str:
     if qtype == "choice_multi":
-        # 支持空格/中英文逗号/分号/斜杠/顿号/竖线等常见分隔，顺序不敏感
-        raw_parts = re.split(r"[,\s;；、/|]+", val.replace("，", ","))
+        raw_parts = _CHOICE_SEP_RE.split(val)
         cleaned = [p.strip().upper() for p in raw_parts if p.strip()]
         # 兼容无分隔符且连续字母的写法，如 "ABC"
         if len(cleaned) == 1 and len(cleaned[0]) > 1 and cleaned[0].isalpha():
@@ -280,13 +288,13 @@ def _serialize_group(
     for q in questions:
         answer = answers.get(q.id)
         question_map.append(
-            schemas.SmartPracticeQuestion(
+            schemas.SmartPracticeQuestion.model_construct(
                 id=q.id,
                 bank_id=q.bank_id,
                 bank_title=bank_title_map.get(q.bank_id),
                 content=q.content,
                 type=q.type,
-                options=[schemas.Option(**opt) for opt in q.options or []],
+                options=schemas.stored_options(q.options),
                 analysis=q.analysis,
                 standard_answer=q.standard_answer,
                 user_answer=answer.user_answer if answer else None,
@@ -300,7 +308,8 @@ def _serialize_group(
     resolved_banks = selected_bank_ids if selected_bank_ids else _resolve_bank_ids_for_draw(db, selected_bank_ids, current_user)
     allowed_types = _derive_selected_types(sp_session.settings_snapshot.get("type_ratio") or {})
     computed_lowest = _compute_lowest_count_remaining(db, resolved_banks, allowed_types) if resolved_banks else None
-    return schemas.SmartPracticeGroup(
+    # 组装自本库数据，无需再做字段校验
+    return schemas.SmartPracticeGroup.model_construct(
         session_id=sp_session.id,
         group_id=group.id,
         group_index=group.group_index,
@@ -330,7 +339,6 @@ def save_settings(db: Session, payload: schemas.SmartPracticeSettingsPayload, us
     if not payload.bank_ids:
         raise HTTPException(status_code=400, detail="请至少选择一个题库")
     _ensure_banks_accessible(db, payload.bank_ids, user)
-    now = datetime.utcnow()
     payload.realtime_analysis = True
     settings = SmartPracticeSettings(
         user_id=user.id,
@@ -339,8 +347,6 @@ def save_settings(db: Session, payload: schemas.SmartPracticeSettingsPayload, us
         guaranteed_low_count=payload.guaranteed_low_count if payload.guaranteed_low_count is not None else 20,
         type_ratio=payload.type_ratio or {},
         realtime_analysis=True,
-        created_at=now,
-        updated_at=now,
     )
     db.add(settings)
     db.commit()
@@ -384,7 +390,6 @@ def start_session(db: Session, user: User) -> schemas.SmartPracticeGroup:
     if not selected:
         raise HTTPException(status_code=400, detail="无法生成题组，题库题目数量不足")
 
-    now = datetime.utcnow()
     snapshot = settings.model_dump(exclude={"created_at", "updated_at", "id"})
     allowed_types = _derive_selected_types(settings.type_ratio)
     lowest_remaining = _compute_lowest_count_remaining(db, effective_bank_ids, allowed_types)
@@ -398,8 +403,6 @@ def start_session(db: Session, user: User) -> schemas.SmartPracticeGroup:
         round=1,
         realtime_analysis=True,
         lowest_count_remaining=lowest_remaining,
-        created_at=now,
-        updated_at=now,
     )
     db.add(sp_session)
     db.flush()  # persist session to satisfy FK before creating group
@@ -540,7 +543,7 @@ def toggle_realtime_analysis(db: Session, session_id: str, value: bool, user: Us
     if not sp_session or sp_session.user_id != user.id:
         raise HTTPException(status_code=404, detail="智能刷题会话不存在")
     sp_session.realtime_analysis = True
-    sp_session.updated_at = datetime.utcnow()
+    sp_session.updated_at = db_utc_now()
     db.add(sp_session)
     db.commit()
     db.refresh(sp_session)
@@ -564,6 +567,43 @@ def _get_current_group(db: Session, sp_session: SmartPracticeSession) -> SmartPr
     return group
 
 
+class _GroupSnapshot(NamedTuple):
+    id: int
+    mode: str
+    created_at: datetime
+    question_ids: list[int]
+
+
+# 题组一经生成不再变化，作答时从 Redis 读取，省去每次作答的题组与题目列表查询
+_GROUP_SNAPSHOT_TTL = 2 * 3600
+
+
+def _current_group_snapshot(db: Session, sp_session: SmartPracticeSession) -> _GroupSnapshot:
+    def build() -> dict:
+        group = _get_current_group(db, sp_session)
+        question_ids = db.exec(
+            select(SmartPracticeItem.question_id)
+            .where(SmartPracticeItem.group_id == group.id)
+            .order_by(SmartPracticeItem.position)
+        ).all()
+        return {
+            "id": group.id,
+            "mode": group.mode,
+            "created_at": group.created_at.isoformat(),
+            "question_ids": list(question_ids),
+        }
+
+    data = response_cache.json_value(
+        f"sp:group:{sp_session.id}:{sp_session.current_group_index}", (), build, ttl=_GROUP_SNAPSHOT_TTL
+    )
+    return _GroupSnapshot(
+        id=data["id"],
+        mode=data["mode"],
+        created_at=datetime.fromisoformat(data["created_at"]),
+        question_ids=data["question_ids"],
+    )
+
+
 def _get_questions_for_group(db: Session, group: SmartPracticeGroup) -> list[Question]:
     items = db.exec(select(SmartPracticeItem).where(SmartPracticeItem.group_id == group.id)).all()
     question_ids = [item.question_id for item in items]
@@ -582,15 +622,13 @@ def answer_question(
     if sp_session.status == "completed":
         raise HTTPException(status_code=400, detail="会话已结束")
 
-    group = _get_current_group(db, sp_session)
-    items = db.exec(select(SmartPracticeItem).where(SmartPracticeItem.group_id == group.id)).all()
-    item_ids = {item.question_id for item in items}
-    if payload.question_id not in item_ids:
+    group = _current_group_snapshot(db, sp_session)
+    if payload.question_id not in group.question_ids:
         raise HTTPException(status_code=400, detail="题目不属于当前题组")
     # persist当前位置
     if payload.current_index is not None:
         sp_session.current_question_index = payload.current_index
-        sp_session.updated_at = datetime.utcnow()
+        sp_session.updated_at = db_utc_now()
         db.add(sp_session)
 
     question = db.get(Question, payload.question_id)
@@ -624,7 +662,7 @@ def answer_question(
             existing.user_answer = raw_answer
             existing.is_correct = is_correct
             existing.counted = False
-            existing.answered_at = datetime.utcnow()
+            existing.answered_at = db_utc_now()
             db.add(existing)
         else:
             db.add(
@@ -634,7 +672,6 @@ def answer_question(
                     user_answer=raw_answer,
                     is_correct=is_correct,
                     counted=False,
-                    answered_at=datetime.utcnow(),
                 )
             )
         db.commit()
@@ -651,7 +688,7 @@ def answer_question(
             existing.user_answer = raw_answer
             existing.is_correct = is_correct
             existing.counted = False
-            existing.answered_at = datetime.utcnow()
+            existing.answered_at = db_utc_now()
             db.add(existing)
             if not is_correct:
                 question.practice_count = 0
@@ -674,7 +711,7 @@ def answer_question(
         if not existing.is_correct:
             existing.user_answer = raw_answer
             existing.is_correct = is_correct
-            existing.answered_at = datetime.utcnow()
+            existing.answered_at = db_utc_now()
             db.add(existing)
             if not is_correct:
                 question.practice_count = 0
@@ -691,7 +728,7 @@ def answer_question(
         existing.is_correct = is_correct
         should_increment = counted and not existing.counted and group.mode != "reinforce"
         existing.counted = existing.counted or should_increment
-        existing.answered_at = datetime.utcnow()
+        existing.answered_at = db_utc_now()
         db.add(existing)
         if should_increment:
             question.practice_count += 1
@@ -710,7 +747,6 @@ def answer_question(
         user_answer=raw_answer,
         is_correct=is_correct,
         counted=counted and group.mode != "reinforce",
-        answered_at=datetime.utcnow(),
     )
     db.add(answer_record)
 
@@ -762,8 +798,16 @@ def _wrong_questions_for_group(db: Session, sp_session: SmartPracticeSession, gr
     # 考试模式：在提交组时统一判分并计数
     if not sp_session.realtime_analysis:
         current_answers = list(recent_answers.values())
-        questions = db.exec(select(Question).where(Question.id.in_(item_question_ids))).all()
-        qmap = {q.id: q for q in questions}
+        qmap = {
+            q.id: q
+            for q in db.exec(
+                select(Question.id, Question.type, Question.standard_answer).where(Question.id.in_(item_question_ids))
+            )
+        }
+        results = {ans.question_id: ans.is_correct for ans in current_answers}
+        graded: dict[bool, list[int]] = {True: [], False: []}
+        increment_ids: list[int] = []
+        reset_ids: list[int] = []
         for ans in current_answers:
             q = qmap.get(ans.question_id)
             if not q:
@@ -771,19 +815,33 @@ def _wrong_questions_for_group(db: Session, sp_session: SmartPracticeSession, gr
             normalized_answer = _normalize_answer(ans.user_answer.strip(), q.type)
             normalized_standard = _normalize_answer(q.standard_answer.strip(), q.type)
             is_correct = normalized_answer == normalized_standard and normalized_standard != ""
-            was_counted = ans.counted
-            ans.is_correct = is_correct
-            ans.counted = is_correct and group.mode != "reinforce"
-            ans.answered_at = datetime.utcnow()
-            db.add(ans)
-            if ans.counted and not was_counted:
-                q.practice_count += 1
-                db.add(q)
+            counted = is_correct and group.mode != "reinforce"
+            results[ans.question_id] = is_correct
+            graded[is_correct].append(ans.id)
+            if counted and not ans.counted:
+                increment_ids.append(q.id)
             if not is_correct:
-                q.practice_count = 0
-                db.add(q)
+                reset_ids.append(q.id)
+        # 按判分结果分组，整组一次性写回，而不是逐行 UPDATE
+        now = db_utc_now()
+        for is_correct, answer_ids in graded.items():
+            if answer_ids:
+                db.exec(
+                    update(SmartPracticeAnswer)
+                    .where(SmartPracticeAnswer.id.in_(answer_ids))
+                    .values(is_correct=is_correct, counted=is_correct and group.mode != "reinforce", answered_at=now)
+                )
+        if increment_ids:
+            db.exec(
+                update(Question)
+                .where(Question.id.in_(increment_ids))
+                .values(practice_count=Question.practice_count + 1)
+            )
+        if reset_ids:
+            db.exec(update(Question).where(Question.id.in_(reset_ids)).values(practice_count=0))
         db.commit()
-        answered_map = {a.question_id: a for a in current_answers}
+        # 提交后 ORM 对象已过期，直接用本地判分结果，避免逐条刷新
+        return [qid for qid, is_correct in results.items() if not is_correct]
 
     wrong = [qid for qid, a in answered_map.items() if not a.is_correct]
     return wrong
@@ -835,7 +893,7 @@ def next_group(db: Session, session_id: str, user: User) -> schemas.SmartPractic
     group = _build_group(db, sp_session, questions, mode=mode, group_index=group_index)
     sp_session.current_group_index = group_index
     sp_session.current_question_index = 0
-    sp_session.updated_at = datetime.utcnow()
+    sp_session.updated_at = db_utc_now()
     db.add(sp_session)
     db.commit()
     db.refresh(group)
@@ -854,7 +912,7 @@ def finish_session(db: Session, session_id: str, user: User) -> None:
     if not sp_session or sp_session.user_id != user.id:
         raise HTTPException(status_code=404, detail="智能刷题会话不存在")
     sp_session.status = "completed"
-    sp_session.updated_at = datetime.utcnow()
+    sp_session.updated_at = db_utc_now()
     db.add(sp_session)
     db.commit()
 
@@ -866,10 +924,8 @@ def feedback_and_skip(db: Session, session_id: str, payload: schemas.SmartPracti
     question = db.get(Question, payload.question_id)
     if not question:
         raise HTTPException(status_code=404, detail="题目不存在")
-    current_group = _get_current_group(db, sp_session)
-    items = db.exec(select(SmartPracticeItem).where(SmartPracticeItem.group_id == current_group.id)).all()
-    item_ids = {item.question_id for item in items}
-    if payload.question_id not in item_ids:
+    current_group = _current_group_snapshot(db, sp_session)
+    if payload.question_id not in current_group.question_ids:
         raise HTTPException(status_code=400, detail="题目不属于当前题组")
 
     # 保存反馈
@@ -889,12 +945,11 @@ def feedback_and_skip(db: Session, session_id: str, payload: schemas.SmartPracti
             SmartPracticeAnswer.session_id == session_id, SmartPracticeAnswer.question_id == payload.question_id
         )
     ).first()
-    now = datetime.utcnow()
     if existing:
         existing.user_answer = payload.reason or "反馈剔除"
         existing.is_correct = True
         existing.counted = False
-        existing.answered_at = now
+        existing.answered_at = db_utc_now()
         db.add(existing)
     else:
         db.add(
@@ -904,7 +959,6 @@ def feedback_and_skip(db: Session, session_id: str, payload: schemas.SmartPracti
                 user_answer=payload.reason or "反馈剔除",
                 is_correct=True,
                 counted=False,
-                answered_at=now,
             )
         )
     db.commit()
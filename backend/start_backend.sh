@@ -1,4 +1,4 @@
 #!/bin/sh
-#uv run uvicorn main:app --log-level info --host 0.0.0.0  --port 8000 --workers 4
+# Worker count defaults to 2 * CPU + 1, at most 4; override with WEB_CONCURRENCY.
 
-exec uvicorn main:app --host 0.0.0.0 --port 8000 --workers 4
\ No newline at end of file
+exec python main.py
@@ -0,0 +1,58 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.ai_service import AIService, AIServiceError
+
+
+def test_concurrent_identical_images_share_one_gemini_call():
+    service = AIService(api_key="test", api_base="http://gemini.invalid", model="m")
+    calls = []
+
+    async def fake_invoke(body: bytes) -> str:
+        calls.append(body)
+        await asyncio.sleep(0.01)
+        return '[{"type": "short_answer", "content": "题干", "standard_answer": "答案"}]'
+
+    service._invoke_gemini = fake_invoke  # type: ignore[method-assign]
+
+    async def run():
+        return await asyncio.gather(
+            service.generate_questions_from_image("aGVsbG8=", bank_id=1),
+            service.generate_questions_from_image("aGVsbG8=", bank_id=2),
+        )
+
+    first, second = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert first[0].bank_id == 1 and second[0].bank_id == 2
+    assert service._inflight == {}
+
+
+def test_parse_questions_accepts_fenced_and_wrapped_json():
+    service = AIService(api_key=None, api_base="http://gemini.invalid", model="m")
+    item = '{"type": "choice_single", "content": "题干", "options": [{"key": "A", "text": "甲"}], "standard_answer": "A"}'
+
+    fenced = service._parse_questions(f"```json\n[{item}]\n```", bank_id=3)
+    wrapped = service._parse_questions(f"以下是题目：[{item}] 完毕", bank_id=3)
+
+    assert fenced == wrapped
+    assert fenced[0].bank_id == 3 and fenced[0].options[0].key == "A"
+    with pytest.raises(AIServiceError):
+        service._parse_questions("not json", bank_id=3)
+
+
+def test_api_key_is_sent_as_header_not_query():
+    service = AIService(api_key="secret", api_base="http://gemini.invalid/", model="m")
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={"candidates": [{"content": {"parts": [{"text": "[]"}]}}]})
+
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    assert asyncio.run(service._invoke_gemini(b"{}")) == "[]"
+
+    assert str(seen[0].url) == "http://gemini.invalid/v1beta/models/m:generateContent"
+    assert seen[0].headers["x-goog-api-key"] == "secret"
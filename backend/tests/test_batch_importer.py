@@ -0,0 +1,50 @@
+import asyncio
+import logging
+
+import pytest
+
+from app.models.schemas import BatchImportRequest, QuestionCreate
+from app.services import batch_importer
+from app.services.batch_importer import BatchImportService
+
+
+@pytest.fixture(autouse=True)
+def _log_to_tmp_path(tmp_path, monkeypatch):
+    # keep import logs out of backend/logs while testing
+    handler = logging.FileHandler(tmp_path / "batch_import.log", encoding="utf-8", delay=True)
+    monkeypatch.setattr(batch_importer.logger, "handlers", [handler])
+    yield
+    handler.close()
+
+
+def test_files_are_recognised_concurrently(tmp_path):
+    for name in ("a.txt", "b.txt", "c.txt", "d.txt"):
+        (tmp_path / name).write_text(name, encoding="utf-8")
+    service = BatchImportService(session=None, ai=None)  # type: ignore[arg-type]
+    running = 0
+    peak = 0
+
+    async def fake_process(path, bank_id):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if path.name == "b.txt":
+            raise RuntimeError("boom")
+        return [QuestionCreate(bank_id=bank_id, type="short_answer", content=path.name, standard_answer="x")]
+
+    def fake_store(questions, result):
+        result.imported += len(questions)
+
+    service._process_file = fake_process  # type: ignore[method-assign]
+    service._store_questions = fake_store  # type: ignore[method-assign]
+
+    response = asyncio.run(
+        service.import_directory(BatchImportRequest(bank_id=1, directory=str(tmp_path), concurrency=2))
+    )
+
+    assert peak == 2
+    assert response.imported_questions == 3 and response.failed_files == 1
+    failed = [r for r in response.file_results if r.errors]
+    assert len(failed) == 1 and failed[0].filename.endswith("b.txt") and failed[0].errors == ["boom"]
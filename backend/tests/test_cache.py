@@ -0,0 +1,29 @@
+from app.core.cache import ResponseCache
+
+
+def test_cache_falls_back_to_builder_when_redis_is_down():
+    cache = ResponseCache("redis://127.0.0.1:1/0")
+    calls = []
+
+    def build():
+        calls.append(1)
+        return {"items": [], "total": 0}
+
+    first = cache.json_response("questions:1", ("bank:1",), build)
+    second = cache.json_response("questions:1", ("bank:1",), build)
+    cache.bump("bank:1")  # 不应抛出异常
+
+    assert first.body == second.body == b'{"items":[],"total":0}'
+    assert len(calls) == 2
+
+
+def test_count_falls_back_to_builder_when_redis_is_down():
+    cache = ResponseCache("redis://127.0.0.1:1/0")
+
+    assert cache.count("qcount:1", ("bank:1",), lambda: 42) == 42
+
+
+def test_json_value_falls_back_to_builder_when_redis_is_down():
+    cache = ResponseCache("redis://127.0.0.1:1/0")
+
+    assert cache.json_value("sp:group:s:0", (), lambda: {"question_ids": [3, 1]}) == {"question_ids": [3, 1]}
@@ -0,0 +1,98 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app import dependencies
+from app.models.db_models import User
+
+
+class _FakeSession:
+    """Answers every query with ``value`` and counts how often it was asked."""
+
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def exec(self, statement):
+        self.calls += 1
+        return SimpleNamespace(first=lambda: self.value)
+
+
+class _Generations:
+    """Stands in for the Redis generation counters; ``down`` mimics an unreachable Redis."""
+
+    def __init__(self):
+        self.counters = {}
+        self.down = False
+
+    def generation(self, name):
+        return None if self.down else str(self.counters.get(name, 0))
+
+    def bump(self, *names):
+        for name in names:
+            self.counters[name] = self.counters.get(name, 0) + 1
+
+
+@pytest.fixture
+def generations(monkeypatch):
+    fake = _Generations()
+    monkeypatch.setattr(dependencies, "response_cache", fake)
+    return fake
+
+
+def test_cached_user_omits_password_hash_and_is_dropped_by_forget_user(generations):
+    session = _FakeSession(User(id=7, username="alice", hashed_password="h", role="admin"))
+    dependencies.forget_user("alice")
+
+    dependencies._find_user(session, "alice")
+    cached = dependencies._find_user(session, "alice")
+    assert session.calls == 1
+    assert cached.hashed_password is None and cached.role == "admin"
+    assert "hashed_password" not in dependencies._user_cache["alice"][2]
+
+    session.value = User(id=7, username="alice", hashed_password="h", role="user")
+    dependencies.forget_user("alice")
+    assert dependencies._find_user(session, "alice").role == "user"
+    assert session.calls == 2
+
+
+def test_user_cache_is_bypassed_while_redis_is_down(generations):
+    session = _FakeSession(User(id=8, username="bob", hashed_password="h", role="user"))
+    generations.down = True
+
+    dependencies._find_user(session, "bob")
+    dependencies._find_user(session, "bob")
+    assert session.calls == 2
+
+
+def test_bank_visibility_is_cached_until_forgotten(generations):
+    session = _FakeSession(True)
+    dependencies.forget_bank(42)
+
+    assert dependencies.bank_visibility(session, 42) is True
+    assert dependencies.bank_visibility(session, 42) is True
+    assert session.calls == 1
+
+    session.value = False
+    dependencies.forget_bank(42)
+    assert dependencies.bank_visibility(session, 42) is False
+    assert session.calls == 2
+
+
+def test_bank_bump_from_another_worker_invalidates(generations):
+    session = _FakeSession(True)
+    dependencies.bank_visibility(session, 44)
+
+    session.value = False
+    generations.bump("bank:44")  # another process handled the update
+    assert dependencies.bank_visibility(session, 44) is False
+    assert session.calls == 2
+
+
+def test_missing_bank_is_not_cached(generations):
+    session = _FakeSession(None)
+    dependencies.forget_bank(43)
+
+    assert dependencies.bank_visibility(session, 43) is None
+    assert dependencies.bank_visibility(session, 43) is None
+    assert session.calls == 2
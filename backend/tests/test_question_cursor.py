@@ -0,0 +1,19 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.questions import _decode_cursor, _encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 5, 1, 8, 30, 15, 123456)
+
+    assert _decode_cursor(_encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+def test_malformed_cursor_is_rejected():
+    with pytest.raises(HTTPException) as exc_info:
+        _decode_cursor("not-a-cursor")
+
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,32 @@
+from types import SimpleNamespace
+
+import pytest
+from jose import JWTError
+
+from app.core import security
+
+
+def test_cached_token_still_expires(monkeypatch):
+    token = security.create_access_token({"sub": "alice"}, expires_minutes=5)
+    assert security.decode_token(token)["sub"] == "alice"
+
+    later = security.time.time() + 10 * 60
+    monkeypatch.setattr(security, "time", SimpleNamespace(time=lambda: later))
+
+    with pytest.raises(JWTError):
+        security.decode_token(token)
+
+
+def test_tampered_token_is_rejected():
+    token = security.create_access_token({"sub": "alice"})
+
+    with pytest.raises(JWTError):
+        security.decode_token(token[:-2] + ("AA" if not token.endswith("AA") else "BB"))
+
+
+def test_verify_password_matches_passlib():
+    hashed = security.get_password_hash("s3cret-密码")
+
+    assert security.verify_password("s3cret-密码", hashed)
+    assert not security.verify_password("s3cret", hashed)
+    assert security.pwd_context.verify("s3cret-密码", hashed)
@@ -10,3 +10,11 @@ def test_normalize_choice_multi_contiguous_letters():
 def test_normalize_choice_multi_mixed_delimiters():
     # 兼容中英文逗号和空格
     assert study._normalize_answer("b c，d", "choice_multi") == "B,C,D"
+
+
+def test_wrong_until_three_consecutive_correct():
+    # 结果按时间倒序：最近一次在前
+    assert study._is_still_wrong([False])
+    assert study._is_still_wrong([True, True, False])
+    assert not study._is_still_wrong([True, True, True, False])
+    assert not study._is_still_wrong([True, True])
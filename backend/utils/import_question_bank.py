@@ -41,9 +41,10 @@ import httpx
 from openai import AsyncOpenAI
 from sqlmodel import Session, select
 
+from app.core.cache import response_cache
 from app.core.config import settings
 from app.db import engine, init_db
-from app.models.db_models import Bank, Question as QuestionDB
+from app.models.db_models import Bank
 from app.models.schemas import Option, QuestionCreate
 from app.services.ai_service import AIServiceError
 from app.services.batch_importer import BatchImportService
@@ -348,25 +349,12 @@ async def parse_chunk_with_ai(
 
 
 def import_questions(session: Session, importer: BatchImportService, bank: Bank, questions: List[QuestionCreate]) -> dict:
-    stats = {"imported": 0, "duplicates": 0}
-    for q in questions:
-        dup = importer._find_duplicate(q)  # type: ignore[attr-defined]
-        if dup:
-            stats["duplicates"] += 1
-            continue
-        record = QuestionDB(
-            bank_id=q.bank_id,
-            type=q.type,
-            content=q.content,
-            options=[opt.model_dump() for opt in q.options],
-            standard_answer=q.standard_answer,
-            analysis=q.analysis,
-        )
-        session.add(record)
-        session.commit()
-        session.refresh(record)
-        stats["imported"] += 1
-    return stats
+    # 与批量导入共用去重逻辑：一次查询候选、一次批量 INSERT、一次提交
+    result = importer.store_questions(questions, bank.id, source=bank.title)
+    if result.imported:
+        # 与 API 导入一致，让各 worker 缓存的题目列表和计数失效
+        response_cache.bump("questions", f"bank:{bank.id}")
+    return {"imported": result.imported, "duplicates": result.duplicates}
 
 
 async def _parse_chunk_task(